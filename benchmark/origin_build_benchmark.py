@@ -0,0 +1,71 @@
+"""
+原问题模型建模耗时的基准测试：对比 "loop"（逐个 addConstr）与 "batched"（addConstrs 批量构造）两种构造方式，
+并校验二者建出的模型规模（变量数、约束数、非零元数）与右端项、目标系数之和一致。
+
+用法（在项目根目录下）：
+    python -m benchmark.origin_build_benchmark
+    python -m benchmark.origin_build_benchmark --customers 10 20 40 --formulations two_index
+"""
+import argparse
+import math
+import os
+import tempfile
+import time
+
+import gurobipy as gp
+
+from benchmark.pricing_benchmark import write_random_instance
+from source.info.input_data import InputData
+from source.model.origin_model import OriginModel
+from source.utils import constant
+
+
+def build_model(input_data: InputData, formulation: str, build_mode: str):
+    """按指定方式建模，返回 (建模耗时, 模型指纹)"""
+    constant.ORIGIN_MODEL_FORMULATION = formulation
+    constant.ORIGIN_MODEL_BUILD = build_mode
+    origin_model = OriginModel(input_data=input_data)
+    st = time.perf_counter()
+    origin_model.initialize()
+    build_time = time.perf_counter() - st
+    model = origin_model.model
+    fingerprint = (model.NumVars, model.NumConstrs, model.NumNZs,
+                   round(sum(model.getAttr("RHS", model.getConstrs())), 6),
+                   round(sum(model.getAttr("Obj", model.getVars())), 6))
+    model.dispose()
+    return build_time, fingerprint
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, nargs="*", default=[10, 20, 30, 40], help="随机算例的客户数")
+    parser.add_argument("--vehicles", type=int, default=None, help="车辆数，默认为客户数的1/3（向上取整）")
+    parser.add_argument("--capacity", type=int, default=100, help="随机算例的车辆容量")
+    parser.add_argument("--formulations", nargs="*", default=list(OriginModel.FORMULATIONS),
+                        choices=OriginModel.FORMULATIONS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    gp.setParam("OutputFlag", 0)
+
+    print(f"{'formulation':<14}{'cust':>6}{'vars':>10}{'constrs':>10}{'loop(s)':>10}{'batched(s)':>12}"
+          f"{'speedup':>10}{'same':>8}")
+    all_same = True
+    for num_customers in args.customers:
+        with tempfile.TemporaryDirectory() as folder:
+            write_random_instance(folder, num_customers, args.capacity, args.seed)
+            input_data = InputData(input_folder=os.path.join(folder, ""))
+        input_data.vehicle_info.count = args.vehicles or math.ceil(num_customers / 3)
+        for formulation in args.formulations:
+            loop_time, loop_fingerprint = build_model(input_data, formulation, "loop")
+            batched_time, batched_fingerprint = build_model(input_data, formulation, "batched")
+            same = loop_fingerprint == batched_fingerprint
+            all_same &= same
+            print(f"{formulation:<14}{num_customers:>6}{loop_fingerprint[0]:>10}{loop_fingerprint[1]:>10}"
+                  f"{loop_time:>10.3f}{batched_time:>12.3f}{loop_time / batched_time:>9.2f}x{'yes' if same else 'NO':>8}")
+
+    if not all_same:
+        raise SystemExit("两种构造方式建出的模型不一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+定价子问题标签引擎的基准测试：对比 "dict" 与 "bitset" 两种引擎的耗时，并校验二者生成的列完全一致。
+随机算例还在较紧的最大在途时间下各测一次（时间约束起作用时，回到车场的时间递推也要一致）。
+
+用法（在项目根目录下）：
+    python -m benchmark.pricing_benchmark
+    python -m benchmark.pricing_benchmark --customers 15 --repeat 3
+    python -m benchmark.pricing_benchmark --customers 9 --tight-time-limits 300 400
+"""
+import argparse
+import csv
+import glob
+import os
+import random
+import tempfile
+import time
+
+from source.info.input_data import InputData
+from source.model.sub_model import PricingSubproblem
+from source.utils import constant, filename
+
+DATA_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def make_dual_values(input_data: InputData):
+    """构造基准对偶值：pi_i 取单客户往返路径的成本，使多客户路径普遍具有负缩减成本"""
+    pi = {i: input_data.distance_matrix[(0, i)] + input_data.distance_matrix[(i, 0)]
+          for i in input_data.customer_dict if i != 0}
+    return {'pi': pi, 'theta': 0}
+
+
+def write_random_instance(folder: str, num_customers: int, capacity: int, seed: int):
+    """按 data_cap_* 的数据范围随机生成算例，写入 folder"""
+    rng = random.Random(seed)
+    with open(os.path.join(folder, filename.CUSTOMER_FILE), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["customer_id", "x_coord", "y_coord", "delivery_qty", "pick_up_qty", "service_time"])
+        writer.writerow([0, 100, 80, 0, 0, 10])
+        for i in range(1, num_customers + 1):
+            writer.writerow([i, rng.randint(0, 140), rng.randint(0, 140), rng.randint(15, 25),
+                             rng.randint(15, 25), rng.choice([10, 15, 20, 25, 40])])
+    with open(os.path.join(folder, filename.VEHICLE_FILE), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["vehicle_count", "vehicle_capacity"])
+        writer.writerow([num_customers, capacity])
+
+
+def run_engine(input_data: InputData, dual_values, engine: str, repeat: int):
+    """重复求解 repeat 次，返回 (最短耗时, 生成的列)"""
+    best_time, routes = float("inf"), None
+    for _ in range(repeat):
+        psp = PricingSubproblem(dual_values=dual_values, input_data=input_data, engine=engine)
+        st = time.perf_counter()
+        routes = psp.solve()
+        best_time = min(best_time, time.perf_counter() - st)
+    return best_time, routes
+
+
+def benchmark_instance(name: str, input_data: InputData, repeat: int):
+    dual_values = make_dual_values(input_data)
+    dict_time, dict_routes = run_engine(input_data, dual_values, "dict", repeat)
+    bitset_time, bitset_routes = run_engine(input_data, dual_values, "bitset", repeat)
+    same = ([(r["path"], r["cost"]) for r in dict_routes]
+            == [(r["path"], r["cost"]) for r in bitset_routes])
+    print(f"{name:<24}{len(input_data.customer_dict) - 1:>6}{len(dict_routes):>9}"
+          f"{dict_time * 1000:>12.2f}{bitset_time * 1000:>12.2f}{dict_time / bitset_time:>9.2f}x"
+          f"{'yes' if same else 'NO':>8}")
+    return same
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="每个算例重复求解次数（取最短耗时）")
+    parser.add_argument("--customers", type=int, nargs="*", default=[10, 12],
+                        help="额外随机算例的客户数")
+    parser.add_argument("--capacity", type=int, default=80, help="随机算例的车辆容量")
+    parser.add_argument("--tight-time-limits", type=float, nargs="*", default=[300],
+                        help="随机算例额外测试的最大在途时间（小于 constant.MAX_TRAVEL_TIME，使时间约束起作用）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'instance':<24}{'cust':>6}{'columns':>9}{'dict(ms)':>12}{'bitset(ms)':>12}{'speedup':>10}{'same':>8}")
+    all_same = True
+    for folder in sorted(glob.glob(os.path.join(DATA_FOLDER, "data_cap_*"))):
+        input_data = InputData(input_folder=os.path.join(folder, ""))
+        all_same &= benchmark_instance(os.path.basename(folder), input_data, args.repeat)
+
+    max_travel_time = constant.MAX_TRAVEL_TIME
+    for num_customers in args.customers:
+        for time_limit in [None] + args.tight_time_limits:
+            # 弧预处理在 InputData 构造时按 constant.MAX_TRAVEL_TIME 进行，因此先设置再读入算例
+            constant.MAX_TRAVEL_TIME = max_travel_time if time_limit is None else time_limit
+            name = f"random_{num_customers}" if time_limit is None else f"random_{num_customers}_t{time_limit:g}"
+            with tempfile.TemporaryDirectory() as folder:
+                write_random_instance(folder, num_customers, args.capacity, args.seed)
+                input_data = InputData(input_folder=os.path.join(folder, ""))
+                all_same &= benchmark_instance(name, input_data, max(1, args.repeat // 10))
+    constant.MAX_TRAVEL_TIME = max_travel_time
+
+    if not all_same:
+        raise SystemExit("两种标签引擎生成的列不一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,11 @@ from source.info.config import Config
 from source.model.model_manager import ModelManager
 from source.model.origin_model import OriginModel
 from source.result.processor import ResultProcessor
-from source.utils import log, status
+from source.utils import log, status, timing
 from source.visual.origin_routes_visual import OriginRoutesVisualization
 from source.visual.cg_routes_visual import CgRoutesVisualization
 from source.visual.iteration_routes_visual import IterationVisualization
+from source.visual import route_renderer
 import logging
 
 
@@ -27,8 +28,8 @@ if __name__ == "__main__":
     status.out_status(0)
     st = time.time()
     try:
-        # 调用 visualize_customers 方法来可视化客户数据
-        input_data.visualize_customers()
+        # 可视化客户数据（按 constant.VISUAL_MODE 在主进程或后台进程中绘制，下同）
+        route_renderer.submit(input_data.visualize_customers)
 
         # 初始化模型
         origin_model = OriginModel(input_data=input_data)
@@ -41,20 +42,15 @@ if __name__ == "__main__":
             logging.info(f"原始模型中，车辆{k}的载货量: {origin_solution['loads'][k]}")
 
         # 可视化原始模型的客户点和车辆路径
-        visualization = OriginRoutesVisualization(input_data, origin_model)
-        visualization.visualize_routes()
+        visualization = OriginRoutesVisualization(input_data, origin_solution)
+        route_renderer.submit(visualization.visualize_routes)
 
         model_manager = ModelManager(input_data=input_data)
         model_manager.run_cg_model()
-        rmp_total_cost = model_manager.rmp.mp_obj
-        logging.info(f"松弛的cg模型中，总成本: {rmp_total_cost}")
-
-        cg_routes = model_manager.imp_routes
-        cg_total_cost = model_manager.imp_total_cost
-        logging.info(f"完整的cg模型中，选择路径: {cg_routes}")
-        logging.info(f"完整的cg模型中，总成本: {cg_total_cost}")
-
-        result_processor = ResultProcessor(res=cg_routes)
+        # 求解结果整理为不可变对象，之后的日志与可视化只读取该对象
+        result_processor = ResultProcessor(model_manager=model_manager)
+        result_processor.log_summary()
+        cg_result = result_processor.result
 
         logging.info("success")
         logging.info("Total running time:{}".format((time.time() - st)))
@@ -62,13 +58,13 @@ if __name__ == "__main__":
         status.out_status(1)
 
         # 可视化Cg模型的客户点和车辆路径
-        visualization = CgRoutesVisualization(input_data=input_data, model_manager=model_manager)
-        visualization.visualize_routes()
+        visualization = CgRoutesVisualization(input_data=input_data, result=cg_result)
+        route_renderer.submit(visualization.visualize_routes)
 
         # 添加迭代可视化
-        iter_visual = IterationVisualization(input_data=input_data, model_manager=model_manager)
+        iter_visual = IterationVisualization(input_data=input_data, result=cg_result)
         # 保存迭代动画为GIF文件
-        iter_visual.save_animation(f"{config.output_visual}cg_iterations.gif")
+        route_renderer.submit(iter_visual.save_animation, f"{config.output_visual}cg_iterations.gif")
         # 也可以选择保存每次迭代的单独图片
         #iter_visual.visualize_all_iterations()
 
@@ -78,4 +74,9 @@ if __name__ == "__main__":
         logging.exception(e)
         logging.error("fail")
         logging.info("Total running time: {}".format(time.time() - st))
-        status.out_status(-1)
\ No newline at end of file
+        status.out_status(-1)
+    finally:
+        # 等待后台进程中的绘图任务完成
+        route_renderer.wait()
+        # 写出分层耗时分析报告
+        timing.out_profile(config.output_folder)
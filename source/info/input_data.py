@@ -1,21 +1,64 @@
 from ..do.vehicle import  Vehicle
 from ..do.customer import Customer
 from ..info.config import Config
-from ..utils import filename
+from ..utils import constant, filename
+from ..visual.route_renderer import RouteRenderer
+from collections.abc import Mapping
 from typing import Dict
-import math
+import numpy as np
 import csv
-import matplotlib.pyplot as plt
 import os
 
+
+class MatrixView(Mapping):
+    """
+    以 {(i, j): 值} 的字典接口访问稠密矩阵，兼容原来的 distance_matrix 用法。
+    热循环中应直接用 rows[i][j]（嵌套的 Python 列表），避免元组构造与哈希
+    """
+
+    def __init__(self, array: np.ndarray):
+        self.array = array
+        self.rows = array.tolist()
+        self.size = len(self.rows)
+
+    def __getitem__(self, key):
+        i, j = key
+        if not (0 <= i < self.size and 0 <= j < self.size):
+            raise KeyError(key)
+        return self.rows[i][j]
+
+    def __iter__(self):
+        return ((i, j) for i in range(self.size) for j in range(self.size))
+
+    def __len__(self):
+        return self.size * self.size
+
+
 class InputData:
-    def __init__(self):
+    def __init__(self, input_folder: str = None):
+        """
+        :param input_folder: 输入数据目录，默认取 Config.input_folder（当前工作目录）
+        """
         self.customer_dict : Dict[int, Customer] = {}
         self.vehicle_info = None
-        self.distance_matrix : Dict[tuple[int, int], float] = {}
+        self.distance_matrix : MatrixView = None  # (i, j) -> 欧氏距离
+        self.travel_time_matrix : MatrixView = None  # (i, j) -> 行驶时间（距离 / constant.VEHICLE_SPEED）
+        # 按客户编号（车场为0）排列的数组
+        self.coords : np.ndarray = None  # (n, 2) 坐标
+        self.delivery_qty : np.ndarray = None
+        self.pick_up_qty : np.ndarray = None
+        self.service_time : np.ndarray = None
+        # 弧预处理：arc_feasible[i, j] 为 False 的弧不可能出现在任何可行路径中；successors/predecessors 为每个节点的可行后继/前驱
+        self.arc_feasible : np.ndarray = None
+        self.successors : list[list[int]] = []
+        self.predecessors : list[list[int]] = []
+        self.arc_time_limit = None  # 弧预处理所用的最大在途时间
         self.config = Config()
+        if input_folder is not None:
+            self.config.input_folder = input_folder
         self._init_customer_dict_and_vehicle_info()
         self._init_distance_matrix()
+        self._init_arc_feasibility()
 
     def _init_customer_dict_and_vehicle_info(self):
         """从CSV文件加载客户和车辆数据"""
@@ -30,7 +73,7 @@ class InputData:
                     y_coord=int(row['y_coord']),
                     delivery_qty=int(row['delivery_qty']),
                     pick_up_qty=int(row['pick_up_qty']),
-                    service_time=int(row['service_time'])
+                    service_time=int(row.get('service_time') or 0)  # 早期算例无服务时间列，按0处理
                 )
 
         # 2. 读取车辆数据
@@ -44,56 +87,46 @@ class InputData:
 
 
     def _init_distance_matrix(self):
-        """计算所有客户点之间的欧氏距离"""
-        customers = list(self.customer_dict.values())
-        for i in customers:
-            for j in customers:
-                dx = i.x_coord - j.x_coord
-                dy = i.y_coord - j.y_coord
-                self.distance_matrix[(i.customer_id, j.customer_id)] = math.sqrt(dx ** 2 + dy ** 2)
+        """按客户编号建立坐标、需求与服务时间数组，一次广播计算所有客户点之间的欧氏距离与行驶时间"""
+        if sorted(self.customer_dict) != list(range(len(self.customer_dict))):
+            raise ValueError("客户编号必须是从0（车场）开始的连续整数")
+        customers = [self.customer_dict[i] for i in range(len(self.customer_dict))]
+        self.coords = np.array([(c.x_coord, c.y_coord) for c in customers], dtype=np.float64).reshape(-1, 2)
+        self.delivery_qty = np.array([c.delivery_qty for c in customers], dtype=np.int64)
+        self.pick_up_qty = np.array([c.pick_up_qty for c in customers], dtype=np.int64)
+        self.service_time = np.array([c.service_time for c in customers], dtype=np.int64)
+        diff = self.coords[:, np.newaxis, :] - self.coords[np.newaxis, :, :]
+        distance = np.sqrt((diff ** 2).sum(axis=2))
+        self.distance_matrix = MatrixView(distance)
+        self.travel_time_matrix = MatrixView(distance / constant.VEHICLE_SPEED)
+
+    def _init_arc_feasibility(self):
+        """
+        剔除不可能使用的弧 (i, j)：任何经过该弧的路径都满足 取货量 p_i + p_j <= Q（离开 j 时车上至少有这两份取货）、
+        配送量 d_i + d_j <= Q（从车场出发时两份配送货物都在车上），且（距离满足三角不等式时）
+        车场 -> i -> j -> 车场 的在途时间不超过 constant.MAX_TRAVEL_TIME。
+        车场服务时间不计入在途时间（与定价子问题的 extend_label、标签算法及原问题模型的规则一致）。
+        后继/前驱列表按节点编号排列，与逐个遍历所有节点时的扩展顺序一致
+        """
+        travel, pickup, delivery = self.travel_time_matrix.array, self.pick_up_qty, self.delivery_qty
+        service = self.service_time.copy()
+        service[0] = 0
+        self.arc_time_limit = constant.MAX_TRAVEL_TIME
+        route_time = travel[0][:, np.newaxis] + service[:, np.newaxis] + travel + service[np.newaxis, :] \
+            + travel[:, 0][np.newaxis, :]
+        feasible = (route_time <= self.arc_time_limit + 1e-9) \
+            & (pickup[:, np.newaxis] + pickup[np.newaxis, :] <= self.vehicle_info.capacity) \
+            & (delivery[:, np.newaxis] + delivery[np.newaxis, :] <= self.vehicle_info.capacity)
+        np.fill_diagonal(feasible, False)
+        self.arc_feasible = feasible
+        self.successors = [np.flatnonzero(row).tolist() for row in feasible]
+        self.predecessors = [np.flatnonzero(col).tolist() for col in feasible.T]
 
     def visualize_customers(self):
         """可视化客户数据"""
-        customers = list(self.customer_dict.values())
-
-        # 提取客户信息
-        customer_ids = [customer.customer_id for customer in customers]
-        x_coords = [customer.x_coord for customer in customers]
-        y_coords = [customer.y_coord for customer in customers]
-
-        # 创建图形
-        plt.figure(figsize=(10, 8))
-
-        # 绘制客户点
-        for i, (x, y) in enumerate(zip(x_coords, y_coords)):
-            plt.scatter(x, y, color='blue', s=100)  # 绘制点
-            plt.text(x, y, f"{customer_ids[i]}", fontsize=12, ha='right')  # 标注客户ID
-
-        # 绘制灰色虚线连接每个客户点
-        for i in range(len(customer_ids)):
-            for j in range(i + 1, len(customer_ids)):
-                plt.plot([x_coords[i], x_coords[j]], [y_coords[i], y_coords[j]], color='gray', linestyle='--',
-                         linewidth=0.5)
-
-        # 设置图形标题和坐标轴标签
-        plt.title("Customer Locations", fontsize=16)
-        plt.xlabel("X Coordinate", fontsize=12)
-        plt.ylabel("Y Coordinate", fontsize=12)
-
-        # 显示网格
-        plt.grid(True, linestyle='--', alpha=0.5)
-
-        # 1. 定义保存目录（当前工作目录下的visualize文件夹）
-        save_dir = "visualize"  # 文件夹名称
-        # 2. 若文件夹不存在，则创建（避免路径不存在报错）
-        if not os.path.exists(save_dir):
-            os.makedirs(save_dir)  # 创建文件夹（支持多级目录，如"a/b/c"）
-        # 3. 拼接完整保存路径（文件夹 + 文件名）
-        save_path = os.path.join(save_dir, "Customer Locations.png")
-        # 4. 保存图像（dpi=300保证清晰度，bbox_inches避免标题/标签被截断）
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        # 显示图形（需在savefig之后，否则保存的是空白图）
-        plt.show()
+        renderer = RouteRenderer.for_positions(self.get_customer_positions())
+        # 保存到当前工作目录下的visualize文件夹
+        renderer.save_routes([], [], "Customer Locations", os.path.join("visualize", "Customer Locations.png"))
 
     def get_customer_positions(self):
         """获取客户点的坐标"""
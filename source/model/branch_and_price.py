@@ -0,0 +1,303 @@
+import heapq
+import itertools
+import logging
+import math
+import multiprocessing
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from gurobipy import GRB
+from ..utils import constant, timing
+
+
+class BranchNode:
+    """分支定价树的节点：记录从根节点到该节点的全部分支决策"""
+    __slots__ = ("node_id", "depth", "bound", "forbidden_arcs", "required_arcs", "min_vehicles", "max_vehicles")
+
+    def __init__(self, node_id: int, depth: int, bound: float, forbidden_arcs: frozenset, required_arcs: frozenset,
+                 min_vehicles: int, max_vehicles: int):
+        self.node_id = node_id  # 子节点在加入待处理队列时才编号
+        self.depth = depth
+        self.bound = bound  # 父节点的下界（节点求解前）或本节点主问题的最优值（求解后）
+        self.forbidden_arcs = forbidden_arcs  # 流量固定为0的弧
+        self.required_arcs = required_arcs  # 流量固定为1的弧
+        self.min_vehicles = min_vehicles
+        self.max_vehicles = max_vehicles
+
+    def pricing_forbidden_arcs(self, nodes):
+        """
+        转换为定价与主问题使用的禁止弧集合：弧 (i, j) 固定为1时，客户 i 只能去往 j、客户 j 只能来自 i，
+        即禁止 (i, k)（k != j，i 为客户）与 (k, j)（k != i，j 为客户）
+        :param nodes: 所有节点编号（含车场0）
+        """
+        forbidden = set(self.forbidden_arcs)
+        for i, j in self.required_arcs:
+            if i != 0:
+                forbidden.update((i, k) for k in nodes if k != j and k != i)
+            if j != 0:
+                forbidden.update((k, j) for k in nodes if k != i and k != j)
+        return forbidden
+
+
+class BranchAndPrice:
+    """
+    分支定价：每个节点在对应的分支决策下重新运行列生成（禁止弧同时作用于主问题与定价子问题），
+    节点按下界从小到大（最优下界优先）处理。车辆数为分数时按车辆数分支，否则按流量最接近0.5的弧分支。
+    """
+
+    def __init__(self, model_manager, workers: int = None):
+        """
+        :param model_manager: 已完成根节点列生成的 ModelManager 实例（共用其主问题、定价级联与列池）
+        :param workers: 并行处理节点的进程数，默认取 constant.BNP_WORKERS；None 或 1 为在当前进程中串行处理
+        """
+        self.model_manager = model_manager
+        self.rmp = model_manager.rmp
+        self.nodes = list(range(len(model_manager.input_data.customer_dict)))
+        self.workers = constant.BNP_WORKERS if workers is None else workers
+        self.incumbent_cost = None
+        self.incumbent_routes = {}
+        self.node_count = 0  # 已处理的节点数
+        self.start_time = None
+
+    def artificial_cost(self):
+        """人工变量成本，见 RestrictedMasterProblem.default_artificial_cost"""
+        return self.rmp.default_artificial_cost()
+
+    @timing.record_time_decorator(task_name="分支定价的时长")
+    def solve(self):
+        """
+        :return: (整数解路径 {"Route idx": {'cost', 'path'}}, 总成本)，找不到整数解时总成本为 None
+        """
+        self.start_time = time.time()
+        self.rmp.add_artificial_columns(self.artificial_cost())  # 根节点列生成时通常已加入
+        # 初始列池中最好的初始解作为初始的最好整数解，根节点即可用其成本剪枝
+        initial_sol = self.model_manager.initial_sol
+        if initial_sol.best_solution and len(initial_sol.best_solution) <= self.rmp.max_vehicles:
+            self._update_incumbent(initial_sol.best_solution)
+
+        counter = itertools.count()
+        root = BranchNode(node_id=next(counter), depth=0, bound=-math.inf, forbidden_arcs=frozenset(),
+                          required_arcs=frozenset(), min_vehicles=0, max_vehicles=self.rmp.max_vehicles)
+        open_nodes = []
+        # 根节点总在当前进程中处理，并用其列集合求一次整数规划得到初始的最好整数解
+        self._finish_node(*self._process_node(root), open_nodes, counter)
+        self._restricted_master_heuristic()
+        if self.workers is not None and self.workers > 1:
+            running = self._solve_parallel(open_nodes, counter)
+        else:
+            running = []
+            while open_nodes and not self._reached_limit():
+                _, _, node = heapq.heappop(open_nodes)
+                if self._is_pruned(node.bound):
+                    continue
+                self._finish_node(*self._process_node(node), open_nodes, counter)
+
+        global_bound = self._global_bound(open_nodes, running)
+        logging.info(f"分支定价结束: 处理节点 {self.node_count}, 剩余节点 {len(open_nodes)}, "
+                     f"最好整数解 {self._format(self.incumbent_cost)}, 全局下界 {self._format(global_bound)}, "
+                     f"间隙 {self._format_gap(global_bound)}, 耗时 {time.time() - self.start_time:.4f}s")
+
+        # 主问题恢复为根节点（不含分支决策）
+        self.rmp.set_branching(forbidden_arcs=set(), min_vehicles=0, max_vehicles=root.max_vehicles)
+        self.model_manager.pricing_cascade.forbidden_arcs = set()
+        self.rmp.solve()
+        return self.incumbent_routes, self.incumbent_cost
+
+    def _solve_parallel(self, open_nodes, counter):
+        """
+        用进程池并行处理节点：每个进程持有自己的主问题（由根节点的列集合建立）与定价级联，
+        最好整数解的成本通过共享变量传给各进程作为列生成的提前终止阈值。返回仍在处理中的节点
+        """
+        routes = [route for idx, route in enumerate(self.rmp.routes)
+                  if not self.rmp.column_pool.by_index[idx].disabled]
+        ng_neighbourhood = self.model_manager.ng_neighbourhood
+        context = multiprocessing.get_context("spawn")  # 子进程重新初始化 Gurobi 环境
+        incumbent = context.Value("d", math.inf if self.incumbent_cost is None else self.incumbent_cost)
+        running = {}
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(_constant_values(), self.model_manager.input_data, routes,
+                                           ng_neighbourhood.neighbours if ng_neighbourhood else None,
+                                           self.artificial_cost(), incumbent)) as pool:
+            while open_nodes or running:
+                if self._reached_limit():
+                    for future in running:
+                        future.cancel()
+                    break
+                while open_nodes and len(running) < self.workers:
+                    _, _, node = heapq.heappop(open_nodes)
+                    if not self._is_pruned(node.bound):
+                        running[pool.submit(_process_node_in_worker, node)] = node
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+                    node, children, solution = future.result()
+                    self._finish_node(node, children, solution, open_nodes, counter, running.values())
+                    if self.incumbent_cost is not None:
+                        incumbent.value = self.incumbent_cost
+        return list(running.values())
+
+    def _finish_node(self, node, children, solution, open_nodes, counter, running=()):
+        """记录节点的处理结果：更新最好整数解、子节点编号后加入待处理队列并输出进度"""
+        self.node_count += 1
+        if solution is not None:
+            self._update_incumbent(solution)
+        for child in children:
+            if not self._is_pruned(child.bound):
+                child.node_id = next(counter)
+                heapq.heappush(open_nodes, (child.bound, child.node_id, child))
+        self._log_progress(node, open_nodes, running)
+
+    def _reached_limit(self):
+        if constant.BNP_MAX_NODES is not None and self.node_count >= constant.BNP_MAX_NODES:
+            logging.info(f"分支定价: 达到节点数上限 {constant.BNP_MAX_NODES}")
+            return True
+        if constant.BNP_TIME_LIMIT is not None and time.time() - self.start_time >= constant.BNP_TIME_LIMIT:
+            logging.info(f"分支定价: 达到时间上限 {constant.BNP_TIME_LIMIT}s")
+            return True
+        return False
+
+    def _is_pruned(self, bound):
+        return self.incumbent_cost is not None and bound >= self.incumbent_cost - 1e-6
+
+    def _global_bound(self, open_nodes, running):
+        """全局下界：待处理与处理中节点下界的最小值，没有这样的节点时为最好整数解的成本"""
+        bounds = [bound for bound, _, _ in open_nodes] + [node.bound for node in running]
+        return min([bound for bound in bounds if not self._is_pruned(bound)], default=self.incumbent_cost)
+
+    def _process_node(self, node):
+        """
+        在节点的分支决策下运行列生成
+        :return: (节点, 子节点列表, 整数解路径列表或 None)；得到整数解或节点被剪枝时子节点列表为空
+        """
+        forbidden_arcs = node.pricing_forbidden_arcs(self.nodes)
+        self.rmp.set_branching(forbidden_arcs=forbidden_arcs, min_vehicles=node.min_vehicles,
+                               max_vehicles=node.max_vehicles)
+        self.model_manager.pricing_cascade.forbidden_arcs = forbidden_arcs
+        status, lower_bound = self.model_manager.column_generation(root=False, cutoff=self.incumbent_cost)
+        if status == "infeasible":
+            return node, [], None
+        if status == "cutoff":
+            node.bound = max(node.bound, lower_bound)
+            return node, [], None
+        node.bound = max(node.bound, self.rmp.mp_obj)
+        if sum(var.X for var in self.rmp.artificial_vars.values()) > 1e-6:
+            return node, [], None  # 人工变量取正值：该节点的分支决策下不存在可行解
+        if self._is_pruned(node.bound):
+            return node, [], None
+
+        values = {idx: var.X for idx, var in self.rmp.lambdas.items() if var.X > 1e-6}
+        if all(value > 1 - 1e-6 for value in values.values()):
+            return node, [], [self.rmp.routes[idx] for idx in values]
+
+        vehicles = sum(values.values())
+        if constant.BNP_BRANCH_ON_VEHICLES and abs(vehicles - round(vehicles)) > 1e-6:
+            logging.info(f"分支定价: 节点 {node.node_id} 按车辆数分支 ({vehicles:.4f})")
+            return node, [self._child(node, max_vehicles=math.floor(vehicles)),
+                          self._child(node, min_vehicles=math.ceil(vehicles))], None
+
+        arc_flows = defaultdict(float)
+        for idx, value in values.items():
+            path = self.rmp.routes[idx]["path"]
+            for arc in zip(path, path[1:]):
+                arc_flows[arc] += value
+        fractional = [(abs(flow - 0.5), arc) for arc, flow in arc_flows.items() if 1e-6 < flow < 1 - 1e-6]
+        if not fractional:
+            logging.warning(f"分支定价: 节点 {node.node_id} 的弧流量均为整数但列取值为分数，跳过该节点")
+            return node, [], None
+        _, arc = min(fractional)
+        logging.info(f"分支定价: 节点 {node.node_id} 按弧 {arc} 分支 (流量 {arc_flows[arc]:.4f})")
+        return node, [self._child(node, forbidden_arcs=node.forbidden_arcs | {arc}),
+                      self._child(node, required_arcs=node.required_arcs | {arc})], None
+
+    @staticmethod
+    def _child(node, forbidden_arcs=None, required_arcs=None, min_vehicles=None, max_vehicles=None):
+        return BranchNode(node_id=None, depth=node.depth + 1, bound=node.bound,
+                          forbidden_arcs=node.forbidden_arcs if forbidden_arcs is None else forbidden_arcs,
+                          required_arcs=node.required_arcs if required_arcs is None else required_arcs,
+                          min_vehicles=node.min_vehicles if min_vehicles is None else min_vehicles,
+                          max_vehicles=node.max_vehicles if max_vehicles is None else max_vehicles)
+
+    def _update_incumbent(self, routes):
+        """routes 为整数解中的路径；并行处理时路径可能由其他进程生成，先加入当前进程的主问题以得到列编号"""
+        total_cost = sum(route["cost"] for route in routes)
+        if self.incumbent_cost is not None and total_cost >= self.incumbent_cost - 1e-6:
+            return
+        self.rmp.add_routes([route for route in routes if not self.rmp.is_route_exist(route["path"])])
+        self.incumbent_cost = total_cost
+        self.incumbent_routes = {}
+        for route in routes:
+            idx = self.rmp.column_pool.get(route["path"]).idx
+            self.incumbent_routes[f"Route {idx}"] = {'cost': route['cost'], 'path': route['path']}
+        logging.info(f"分支定价: 更新最好整数解 {total_cost:.4f}")
+
+    @timing.profiled("整数解求解")
+    def _restricted_master_heuristic(self):
+        """在根节点的列集合上求解整数规划，作为初始的最好整数解"""
+        model = self.rmp.model.copy()
+        for var in model.getVars():
+            var.vtype = GRB.BINARY
+        model.optimize()
+        if model.SolCount == 0:
+            return
+        routes = [self.rmp.routes[idx] for idx in self.rmp.lambdas
+                  if model.getVarByName(f"lambda_{idx}").X > 0.5]
+        if all(model.getVarByName(f"artificial_{i}").X < 0.5 for i in self.rmp.artificial_vars):
+            self._update_incumbent(routes)
+        model.dispose()
+
+    def _log_progress(self, node, open_nodes, running):
+        elapsed = time.time() - self.start_time
+        global_bound = self._global_bound(open_nodes, running)
+        logging.info(f"分支定价: 节点 {node.node_id}（深度 {node.depth}）下界 {self._format(node.bound)}, "
+                     f"已处理 {self.node_count}, 待处理 {len(open_nodes)}, 处理中 {len(running)}, "
+                     f"最好整数解 {self._format(self.incumbent_cost)}, 全局下界 {self._format(global_bound)}, "
+                     f"间隙 {self._format_gap(global_bound)}, 吞吐 {self.node_count / max(elapsed, 1e-9):.2f} 节点/秒, "
+                     f"耗时 {elapsed:.4f}s")
+
+    @staticmethod
+    def _format(value):
+        return "-" if value is None else f"{value:.4f}"
+
+    def _format_gap(self, global_bound):
+        if self.incumbent_cost is None or global_bound is None:
+            return "-"
+        return f"{(self.incumbent_cost - global_bound) / max(abs(self.incumbent_cost), 1e-9):.4%}"
+
+
+# 并行分支定价的子进程状态：每个进程一个 BranchAndPrice（含独立的主问题与定价级联）
+_worker_bnp = None
+_worker_incumbent = None
+
+
+def _constant_values():
+    """当前进程中 constant 模块的配置（可能在运行时被修改），传给以 spawn 方式启动的子进程"""
+    return {name: value for name, value in vars(constant).items() if name.isupper()}
+
+
+def _init_worker(constant_values, input_data, routes, ng_neighbours, artificial_cost, incumbent):
+    """子进程初始化：同步配置，用根节点的列集合建立主问题，恢复 ng 邻域并加入人工变量"""
+    global _worker_bnp, _worker_incumbent
+    for name, value in constant_values.items():
+        setattr(constant, name, value)
+    constant.PRICING_WORKERS = None  # 节点已并行处理，子进程内串行定价
+    from ..model.master_model import RestrictedMasterProblem
+    from ..model.model_manager import ModelManager
+    model_manager = ModelManager(input_data=input_data)
+    if ng_neighbours is not None:
+        model_manager.ng_neighbourhood.neighbours = ng_neighbours
+        model_manager.ng_neighbourhood._update_masks()
+    model_manager.rmp = RestrictedMasterProblem(initial_routes=routes, input_data=input_data)
+    model_manager.rmp.model.Params.OutputFlag = 0
+    model_manager.rmp.model.Params.Threads = 1  # 每个进程占一个核
+    model_manager.rmp.add_artificial_columns(artificial_cost)
+    _worker_bnp = BranchAndPrice(model_manager=model_manager, workers=1)
+    _worker_incumbent = incumbent
+
+
+def _process_node_in_worker(node):
+    """在子进程中处理一个节点，以共享的最好整数解成本作为剪枝与提前终止的阈值"""
+    incumbent_cost = _worker_incumbent.value
+    _worker_bnp.incumbent_cost = None if math.isinf(incumbent_cost) else incumbent_cost
+    return _worker_bnp._process_node(node)
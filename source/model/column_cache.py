@@ -0,0 +1,129 @@
+import glob
+import hashlib
+import logging
+import os
+import struct
+
+import numpy as np
+from ..info.input_data import InputData
+from ..model.sub_model import PricingSubproblem
+from ..utils import constant
+
+
+class ColumnCache:
+    """
+    磁盘列缓存：按算例指纹（客户坐标、配送/取货量、服务时间，不含车辆容量与最大在途时间）保存生成过的路径，
+    同一客户集合在不同容量、在途时间下运行时，读取仍可行的路径作为主问题的初始列，运行结束后把新列写回。
+
+    文件格式（小端）：文件头 magic(4s) 版本(H) 客户数(H) 运行次数(I) 列数(I)，
+    之后依次为每列的客户数 uint16[列数]、最近使用的运行次数 uint32[列数]、所有列首尾相接的客户编号 uint16[总客户数]。
+    淘汰策略：每个算例最多保留 COLUMN_CACHE_MAX_COLUMNS 列，按最近使用的运行次数淘汰（本次运行新生成或进入过最优基的列记为使用）；
+    缓存目录最多保留 COLUMN_CACHE_MAX_FILES 个算例，按修改时间淘汰。
+    """
+    MAGIC = b"VRPC"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHHII")
+
+    def __init__(self, input_data: InputData, folder: str = None):
+        """
+        :param input_data: InputData 实例
+        :param folder: 缓存目录，默认取 constant.COLUMN_CACHE_FOLDER
+        """
+        self.input_data = input_data
+        self.folder = folder or constant.COLUMN_CACHE_FOLDER
+        self.num_customers = len(input_data.customer_dict) - 1
+        self.fingerprint = self.instance_fingerprint(input_data)
+        self.file_path = os.path.join(self.folder, f"{self.fingerprint}.bin")
+        self.run = 0  # 本次运行的编号（缓存文件中的运行次数 + 1）
+        self.entries = {}  # 客户序列 -> 最近使用的运行次数（含当前容量下不可行的列，写回时保留）
+
+    @staticmethod
+    def instance_fingerprint(input_data: InputData) -> str:
+        """客户集合的指纹：与车辆容量、最大在途时间无关，这两者变化时列按新参数重新检查可行性"""
+        digest = hashlib.sha1()
+        for array in (input_data.coords, input_data.delivery_qty, input_data.pick_up_qty, input_data.service_time):
+            digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+        return digest.hexdigest()[:16]
+
+    def load(self):
+        """
+        读取缓存文件，返回在当前车辆容量与最大在途时间下可行的路径（按 extend_label 的规则检查，成本重新计算）
+        :return: [{"path": 路径, "cost": 成本}]
+        """
+        self.entries = self._read()
+        checker = PricingSubproblem(dual_values={'pi': {i: 0 for i in range(1, self.num_customers + 1)}, 'theta': 0},
+                                    input_data=self.input_data, engine="dict", bidirectional=False)
+        routes = []
+        for customers in self.entries:
+            path = [0] + list(customers) + [0]
+            label = checker.evaluate_path(path)
+            if label:
+                routes.append({"path": path, "cost": label["cost"]})
+        logging.info(f"列缓存: 读取 {len(self.entries)} 列（运行 {self.run - 1} 次），当前参数下可行 {len(routes)} 列")
+        return routes
+
+    def save(self, routes, used_paths):
+        """
+        合并本次运行的列并写回缓存文件
+        :param routes: 本次运行主问题中的所有列
+        :param used_paths: 本次运行中使用过的列（新生成、进入过最优基或被整数解选中），记为最近使用
+        """
+        used = {tuple(path[1:-1]) for path in used_paths}
+        for route in routes:
+            customers = tuple(route["path"][1:-1])
+            if len(set(customers)) != len(customers):
+                continue  # ng-route 松弛下的非初等路径不可行，不缓存
+            if customers in used or customers not in self.entries:
+                self.entries[customers] = self.run
+        max_columns = constant.COLUMN_CACHE_MAX_COLUMNS
+        kept = sorted(self.entries.items(), key=lambda item: item[1], reverse=True)[:max_columns]
+        evicted = len(self.entries) - len(kept)
+        self.entries = dict(kept)
+        self._write()
+        logging.info(f"列缓存: 写入 {len(self.entries)} 列, 淘汰 {evicted} 列 -> {self.file_path}")
+        self._evict_files()
+
+    def _read(self):
+        entries = {}
+        self.run = 1
+        if not os.path.exists(self.file_path):
+            return entries
+        with open(self.file_path, "rb") as f:
+            data = f.read()
+        magic, version, num_customers, run, num_columns = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC or version != self.VERSION or num_customers != self.num_customers:
+            logging.warning(f"列缓存: 文件 {self.file_path} 格式或版本不符，忽略")
+            return entries
+        offset = self.HEADER.size
+        lengths = np.frombuffer(data, dtype="<u2", count=num_columns, offset=offset)
+        offset += lengths.nbytes
+        last_used = np.frombuffer(data, dtype="<u4", count=num_columns, offset=offset)
+        offset += last_used.nbytes
+        nodes = np.frombuffer(data, dtype="<u2", count=int(lengths.sum()), offset=offset).tolist()
+        start = 0
+        for length, stamp in zip(lengths.tolist(), last_used.tolist()):
+            entries[tuple(nodes[start:start + length])] = stamp
+            start += length
+        self.run = run + 1
+        return entries
+
+    def _write(self):
+        os.makedirs(self.folder, exist_ok=True)
+        customers = list(self.entries)
+        lengths = np.array([len(c) for c in customers], dtype="<u2")
+        last_used = np.array(list(self.entries.values()), dtype="<u4")
+        nodes = np.array([node for c in customers for node in c], dtype="<u2")
+        # 先写临时文件再替换，避免中断时留下不完整的缓存
+        tmp_path = f"{self.file_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.num_customers, self.run, len(customers)))
+            f.write(lengths.tobytes())
+            f.write(last_used.tobytes())
+            f.write(nodes.tobytes())
+        os.replace(tmp_path, self.file_path)
+
+    def _evict_files(self):
+        files = sorted(glob.glob(os.path.join(self.folder, "*.bin")), key=os.path.getmtime, reverse=True)
+        for path in files[constant.COLUMN_CACHE_MAX_FILES:]:
+            os.remove(path)
+            logging.info(f"列缓存: 淘汰算例缓存 {path}")
@@ -0,0 +1,80 @@
+class ColumnInfo:
+    """列的元数据"""
+    __slots__ = ("idx", "path", "added_iteration", "last_reduced_cost", "basis_count", "last_basic_iteration",
+                 "nonbasic_age", "active", "disabled")
+
+    def __init__(self, idx: int, path, added_iteration: int):
+        self.idx = idx  # 在 RestrictedMasterProblem.routes / lambdas 中的编号
+        self.path = path
+        self.added_iteration = added_iteration  # 加入时主问题已求解的次数（初始列为0）
+        self.last_reduced_cost = None  # 最近一次主问题求解后的缩减成本
+        self.basis_count = 0  # 在主问题最优基中出现的次数
+        self.last_basic_iteration = None  # 最近一次出现在最优基中时主问题的求解次数
+        self.nonbasic_age = 0  # 连续多少次求解为非基变量且缩减成本大于阈值
+        self.active = True  # 是否在主问题中（False 表示已被移入侧池）
+        self.disabled = False  # 是否已被停用（上界为0，如不再满足 ng-route 规则），停用的列不再恢复
+
+
+class ColumnPool:
+    """
+    列池：以路径签名为键做 O(1) 判重，并记录每列的加入时间、最近缩减成本和进入最优基的次数。
+    从主问题中移除的列仍留在池中（侧池），可按当前对偶值快速判断是否值得恢复。
+    """
+
+    def __init__(self, purge_rc_threshold: float = 0.0):
+        """
+        :param purge_rc_threshold: 非基变量的缩减成本大于该值时才累计 nonbasic_age
+        """
+        self.columns = {}  # 路径签名 -> ColumnInfo
+        self.by_index = []  # 按主问题中的列编号排列的 ColumnInfo
+        self.purged = {}  # 侧池：列编号 -> ColumnInfo
+        self.purge_rc_threshold = purge_rc_threshold
+
+    @staticmethod
+    def signature(path) -> tuple:
+        """路径签名：按访问顺序排列的客户（车场首尾省略），同时确定了访问的客户集合与顺序"""
+        return tuple(path[1:-1])
+
+    def __contains__(self, path) -> bool:
+        return self.signature(path) in self.columns
+
+    def __len__(self):
+        return len(self.columns)
+
+    def get(self, path):
+        return self.columns.get(self.signature(path))
+
+    def add(self, path, idx: int, iteration: int) -> ColumnInfo:
+        info = ColumnInfo(idx=idx, path=path, added_iteration=iteration)
+        self.columns[self.signature(path)] = info
+        self.by_index.append(info)
+        return info
+
+    def update_stats(self, indices, reduced_costs, basis_status, iteration: int):
+        """
+        用主问题求解后的结果更新元数据
+        :param indices: 主问题中当前各列的编号
+        :param reduced_costs: 与 indices 对应的缩减成本
+        :param basis_status: 与 indices 对应的 VBasis（0 表示基变量）
+        """
+        for idx, reduced_cost, status in zip(indices, reduced_costs, basis_status):
+            info = self.by_index[idx]
+            info.last_reduced_cost = reduced_cost
+            if status == 0:
+                info.basis_count += 1
+                info.last_basic_iteration = iteration
+                info.nonbasic_age = 0
+            elif reduced_cost > self.purge_rc_threshold:
+                info.nonbasic_age += 1
+            else:
+                info.nonbasic_age = 0
+
+    def deactivate(self, idx: int):
+        info = self.by_index[idx]
+        info.active = False
+        info.nonbasic_age = 0
+        self.purged[idx] = info
+
+    def activate(self, idx: int):
+        info = self.purged.pop(idx)
+        info.active = True
@@ -0,0 +1,74 @@
+from bisect import bisect_left, bisect_right
+
+
+def dominates(existing, label) -> bool:
+    """existing 是否支配 label（规则同 PricingSubproblem.is_dominated，visited 子集用位运算判断）"""
+    return (existing.reduced_cost <= label.reduced_cost
+            and existing.total_time <= label.total_time
+            and existing.n_visited <= label.n_visited
+            and existing.visited & label.visited == existing.visited
+            and existing.max_load <= label.max_load
+            and existing.remaining_load <= label.remaining_load)
+
+
+class DominanceIndex:
+    """单个节点的支配索引：标签按已访问客户数分桶，桶内按累计缩减成本升序排列
+
+    只有已访问客户数不多于、且缩减成本不高于新标签的标签才可能支配它，
+    反之亦然，因此检查与淘汰都只需扫描各桶中按成本二分出的一段。
+    """
+    __slots__ = ("buckets",)
+
+    def __init__(self):
+        self.buckets = {}  # 已访问客户数 -> (缩减成本列表, 标签列表)，两列表按缩减成本升序一一对应
+
+    def is_dominated(self, label) -> bool:
+        """检查 label 是否被索引中的某个标签支配"""
+        reduced_cost, total_time, visited = label.reduced_cost, label.total_time, label.visited
+        max_load, remaining_load = label.max_load, label.remaining_load
+        for n_visited, (costs, labels) in self.buckets.items():
+            if n_visited > label.n_visited:
+                continue
+            # 与 dominates 相同的条件，内联以减少热循环中的函数调用
+            for idx in range(bisect_right(costs, reduced_cost)):
+                existing = labels[idx]
+                if (existing.total_time <= total_time
+                        and existing.visited & visited == existing.visited
+                        and existing.max_load <= max_load
+                        and existing.remaining_load <= remaining_load):
+                    return True
+        return False
+
+    def remove_dominated_by(self, label) -> int:
+        """从索引中移除被 label 支配的标签，并将其标记为 dominated，返回移除数量"""
+        removed = 0
+        for n_visited, (costs, labels) in self.buckets.items():
+            if n_visited < label.n_visited:
+                continue
+            start = bisect_left(costs, label.reduced_cost)
+            kept = []
+            for existing in labels[start:]:
+                if dominates(label, existing):
+                    existing.dominated = True
+                else:
+                    kept.append(existing)
+            if len(kept) < len(labels) - start:
+                removed += len(labels) - start - len(kept)
+                labels[start:] = kept
+                costs[start:] = [existing.reduced_cost for existing in kept]
+        return removed
+
+    def add(self, label):
+        if label.n_visited not in self.buckets:
+            self.buckets[label.n_visited] = ([], [])
+        costs, labels = self.buckets[label.n_visited]
+        idx = bisect_right(costs, label.reduced_cost)
+        costs.insert(idx, label.reduced_cost)
+        labels.insert(idx, label)
+
+    def __iter__(self):
+        for _, labels in self.buckets.values():
+            yield from labels
+
+    def __len__(self):
+        return sum(len(labels) for _, labels in self.buckets.values())
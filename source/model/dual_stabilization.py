@@ -0,0 +1,66 @@
+import logging
+from ..utils import constant
+
+
+class DualStabilizer:
+    """
+    对偶稳定化：在主问题对偶值与定价之间构造分离点，抑制对偶值振荡。
+    - smoothing：Wentges 平滑，分离点 = alpha * 稳定中心 + (1 - alpha) * 主问题对偶值
+    - box_step：分离点 = 主问题对偶值截断到以稳定中心为中心、半径为 box_width 的盒子内
+    稳定中心取上一次的分离点。在分离点处找不到对主问题对偶值缩减成本为负的列时称为误定价，
+    此时稳定中心重置为主问题对偶值并重新定价，因此列生成仍只在真实对偶值处定价失败时终止。
+    """
+    MODES = ("smoothing", "box_step")
+
+    def __init__(self, mode=None, alpha=None, box_width=None):
+        """
+        :param mode: "smoothing" / "box_step"，默认取 constant.DUAL_STABILIZATION；None 为不做稳定化
+        :param alpha: 平滑系数，默认取 constant.DUAL_SMOOTHING_ALPHA
+        :param box_width: 盒子半径，默认取 constant.DUAL_BOX_WIDTH
+        """
+        self.mode = constant.DUAL_STABILIZATION if mode is None else mode
+        if self.mode is not None and self.mode not in self.MODES:
+            raise ValueError(f"未知的对偶稳定化方式: {self.mode}")
+        self.alpha = constant.DUAL_SMOOTHING_ALPHA if alpha is None else alpha
+        if not 0 <= self.alpha < 1:
+            raise ValueError("alpha 必须在 [0, 1) 内")
+        self.box_width = constant.DUAL_BOX_WIDTH if box_width is None else box_width
+        if self.box_width <= 0:
+            raise ValueError("box_width 必须为正数")
+        self.center = None  # 稳定中心 {'pi': {客户: 对偶值}, 'theta': 车辆约束对偶值}
+        self.active = False  # 最近一次的分离点是否与主问题对偶值不同
+        self.mispricing_count = 0
+
+    def separation_point(self, pi, theta):
+        """
+        :param pi: 主问题覆盖约束对偶值
+        :param theta: 主问题车辆约束对偶值
+        :return: 用于定价的对偶值 {'pi': ..., 'theta': ...}
+        """
+        if self.mode is None or self.center is None:
+            dual_values = {'pi': dict(pi), 'theta': theta}
+        elif self.mode == "smoothing":
+            alpha, center_pi = self.alpha, self.center['pi']
+            dual_values = {'pi': {i: alpha * center_pi[i] + (1 - alpha) * pi[i] for i in pi},
+                           'theta': alpha * self.center['theta'] + (1 - alpha) * theta}
+        else:
+            width, center_pi = self.box_width, self.center['pi']
+            dual_values = {'pi': {i: min(max(pi[i], center_pi[i] - width), center_pi[i] + width) for i in pi},
+                           'theta': min(max(theta, self.center['theta'] - width), self.center['theta'] + width)}
+        self.active = dual_values['theta'] != theta or any(abs(dual_values['pi'][i] - pi[i]) > 1e-9 for i in pi)
+        if self.mode is not None:
+            self.center = dual_values
+        return dual_values
+
+    def reset(self):
+        """清除稳定中心（分支定价中每个节点重新开始列生成时调用）"""
+        self.center = None
+        self.active = False
+
+    def mispriced(self, pi, theta):
+        """误定价：稳定中心重置为主问题对偶值，返回用于重新定价的对偶值"""
+        self.mispricing_count += 1
+        logging.info(f"对偶稳定化: 第 {self.mispricing_count} 次误定价，回到主问题对偶值重新定价")
+        self.center = {'pi': dict(pi), 'theta': theta}
+        self.active = False
+        return {'pi': dict(pi), 'theta': theta}
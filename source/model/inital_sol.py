@@ -1,85 +1,191 @@
+import logging
+import math
 from ..info.input_data import InputData
+from ..model.sub_model import PricingSubproblem
+from ..utils import constant
 
 
 class InitialSol:
+    """
+    初始列池：用节约算法与若干起始角度的扫描算法构造初始解，再对每个解做 2-opt、relocate、exchange 局部搜索，
+    构造解与改进解中的所有路径（去重）作为主问题的初始列。
+    每条路径都用定价子问题的 evaluate_path 检查，载货量与在途时间规则与 extend_label 一致，因此初始列都是可行路径。
+    """
+
     def __init__(self, input_data: InputData):
         self.input_data = input_data
         self.initial_routes = []
         self.num_customers = len(self.input_data.customer_dict) - 1  # 排除车场
+        self.num_vehicles = self.input_data.vehicle_info.count
+        self.customers = [i for i in self.input_data.customer_dict if i != 0]
+        self.best_solution = []  # 成本最低的初始解（路径字典列表），可作为初始的整数解
+        self.best_cost = None
+        self._dist = self.input_data.distance_matrix.rows
+        # 可行性检查只用到 extend_label 的资源递推，与对偶值无关
+        self._checker = PricingSubproblem(dual_values={'pi': {i: 0 for i in self.customers}, 'theta': 0},
+                                          input_data=self.input_data, engine="dict", bidirectional=False)
+        self._feasible_cache = {}
         self._get_initial_routes()
 
     def _get_initial_routes(self):
-        """生成满足车辆数限制的初始路径"""
-        num_vehicles = self.input_data.vehicle_info.count
-        capacity = self.input_data.vehicle_info.capacity
-
-        # 1. 提取需服务的客户列表（排除车场）
-        customers = [i for i in self.input_data.customer_dict if i != 0]
-
-        # 2. 按总需求降序排序（送货+取货）
-        sorted_customers = sorted(
-            customers,
-            key=lambda x: (
-                    self.input_data.customer_dict[x].delivery_qty
-                    + self.input_data.customer_dict[x].pick_up_qty
-            ),
-            reverse=True
-        )
-
-        # 3. 使用首次适应递减算法分组
-        groups = []
-        current_group = []
-        current_load = 0
-
-        for cust in sorted_customers:
-            delivery = self.input_data.customer_dict[cust].delivery_qty
-            pickup = self.input_data.customer_dict[cust].pick_up_qty
-            total_demand = delivery + pickup
-
-            # 容量检查：总需求不超过车辆容量
-            if current_load + total_demand > capacity:
-                groups.append(current_group)
-                current_group = []
-                current_load = 0
-
-            current_group.append(cust)
-            current_load += total_demand
-
-        if current_group:
-            groups.append(current_group)
-
-        # 4. 确保分组数不超过车辆数（关键修改）
-        if len(groups) > num_vehicles:
-            # 合并多余的分组（示例策略：将最后几个小组合并到前几个组）
-            while len(groups) > num_vehicles:
-                extra_group = groups.pop()
-                groups[-1].extend(extra_group)
-
-        # 5. 为每组生成路径（按插入顺序）
-        for group in groups[:num_vehicles]:  # 严格限制不超过可用车辆数
-            if not group:
+        """构造初始解并做局部搜索，汇总所有路径作为初始列"""
+        solutions = [self._savings()]
+        # 扫描算法的起点在按极角排序的客户中均匀选取
+        order = self._polar_order()
+        num_starts = min(constant.INITIAL_SWEEP_STARTS, len(order))
+        for s in range(num_starts):
+            start = s * len(order) // num_starts
+            solutions.append(self._sweep(order[start:] + order[:start]))
+        if constant.INITIAL_LOCAL_SEARCH:
+            solutions += [self._local_search(solution) for solution in solutions]
+
+        routes = {}
+        best = None
+        for solution in solutions:
+            for customers in solution:
+                path = [0] + customers + [0]
+                if tuple(path) not in routes:
+                    routes[tuple(path)] = {"path": path, "cost": self._cost(customers)}
+            # 优先选择车辆数不超过上限的解
+            key = (len(solution) > self.num_vehicles, sum(self._cost(customers) for customers in solution))
+            if best is None or key < best[0]:
+                best = (key, solution)
+        self.initial_routes = list(routes.values())
+        (over_fleet, self.best_cost), solution = best
+        self.best_solution = [routes[tuple([0] + customers + [0])] for customers in solution]
+        logging.info(f"初始列池: {len(solutions)} 个初始解, {len(self.initial_routes)} 条路径; "
+                     f"最好初始解 {len(self.best_solution)} 条路径, 成本 {self.best_cost:.4f}")
+        if over_fleet:
+            logging.warning(f"初始解使用 {len(self.best_solution)} 条路径，超过车辆数 {self.num_vehicles}，"
+                            f"根节点主问题先由人工变量保证可行")
+
+    def _is_feasible(self, customers):
+        """按 extend_label 的规则检查路径 车场 -> customers -> 车场"""
+        key = tuple(customers)
+        if key not in self._feasible_cache:
+            self._feasible_cache[key] = self._checker.evaluate_path([0] + customers + [0]) is not None
+        return self._feasible_cache[key]
+
+    def _cost(self, customers):
+        dist = self._dist
+        path = [0] + customers + [0]
+        return sum(dist[path[p]][path[p + 1]] for p in range(len(path) - 1))
+
+    def _polar_order(self):
+        """客户按相对车场的极角排序"""
+        depot = self.input_data.customer_dict[0]
+        return sorted(self.customers, key=lambda i: math.atan2(self.input_data.customer_dict[i].y_coord - depot.y_coord,
+                                                               self.input_data.customer_dict[i].x_coord - depot.x_coord))
+
+    def _savings(self):
+        """Clarke-Wright 节约算法：按节约值 d(0,i) + d(0,j) - d(i,j) 降序，把以 i 结尾的路径与以 j 开头的路径首尾相接"""
+        dist = self._dist
+        routes = {i: [i] for i in self.customers}  # 路径编号（取路径中第一个被建立的客户）-> 客户序列
+        route_of = {i: i for i in self.customers}
+        savings = sorted(((dist[0][i] + dist[j][0] - dist[i][j], i, j)
+                          for i in self.customers for j in self.customers if i != j), reverse=True)
+        for saving, i, j in savings:
+            if saving <= 0:
+                break
+            ri, rj = route_of[i], route_of[j]
+            if ri == rj or routes[ri][-1] != i or routes[rj][0] != j:
                 continue
-
-            # 路径构造策略：车场 -> 客户1 -> 客户2 -> ... -> 车场
-            path = [0] + group + [0]
-
-            # 计算路径成本（简单累加相邻节点距离）
-            cost = 0
-            for i in range(len(path) - 1):
-                cost += self.input_data.distance_matrix.get(
-                    (path[i], path[i + 1]), 0
-                )
-
-            self.initial_routes.append({
-                "path": path,
-                "cost": cost,
-                "demand": sum(
-                    self.input_data.customer_dict[c].delivery_qty
-                    + self.input_data.customer_dict[c].pick_up_qty
-                    for c in group
-                )
-            })
-
-        # 6. 验证分组可行性
-        if len(self.initial_routes) > num_vehicles:
-            raise ValueError("无法生成可行初始解：客户需求超过车辆容量限制")
\ No newline at end of file
+            merged = routes[ri] + routes[rj]
+            if not self._is_feasible(merged):
+                continue
+            routes[ri] = merged
+            for c in routes.pop(rj):
+                route_of[c] = ri
+        return list(routes.values())
+
+    def _best_insertion(self, customers, c, max_delta=math.inf):
+        """把客户 c 插入路径中成本增量最小（且小于 max_delta）的可行位置，没有这样的位置时返回 None"""
+        dist = self._dist
+        path = [0] + customers + [0]
+        deltas = []
+        for p in range(len(path) - 1):
+            delta = dist[path[p]][c] + dist[c][path[p + 1]] - dist[path[p]][path[p + 1]]
+            if delta < max_delta:
+                deltas.append((delta, p))
+        deltas.sort()
+        for _, p in deltas:
+            candidate = customers[:p] + [c] + customers[p:]
+            if self._is_feasible(candidate):
+                return candidate
+        return None
+
+    def _sweep(self, order):
+        """扫描算法：按给定顺序把客户插入当前路径，插不进时开始一条新路径"""
+        solution, current = [], []
+        for c in order:
+            candidate = self._best_insertion(current, c) if current else [c]
+            if candidate is None:
+                solution.append(current)
+                candidate = [c]
+            current = candidate
+        if current:
+            solution.append(current)
+        return solution
+
+    def _local_search(self, solution):
+        """依次尝试 2-opt（路径内反转一段）、relocate（移动一个客户）、exchange（交换两个客户），接受第一个改进，直到无改进"""
+        solution = [list(customers) for customers in solution]
+        for _ in range(constant.INITIAL_LOCAL_SEARCH_MOVES):
+            if not (self._two_opt(solution) or self._relocate(solution) or self._exchange(solution)):
+                break
+        return solution
+
+    def _two_opt(self, solution):
+        for r, customers in enumerate(solution):
+            cost = self._cost(customers)
+            for i in range(len(customers) - 1):
+                for j in range(i + 1, len(customers)):
+                    candidate = customers[:i] + customers[i:j + 1][::-1] + customers[j + 1:]
+                    if self._cost(candidate) < cost - 1e-6 and self._is_feasible(candidate):
+                        solution[r] = candidate
+                        return True
+        return False
+
+    def _relocate(self, solution):
+        for a, route_a in enumerate(solution):
+            cost_a = self._cost(route_a)
+            for pos, c in enumerate(route_a):
+                remaining = route_a[:pos] + route_a[pos + 1:]
+                saving = cost_a - self._cost(remaining)
+                for b, route_b in enumerate(solution):
+                    if b == a:
+                        continue
+                    candidate = self._best_insertion(route_b, c, max_delta=saving - 1e-6)
+                    if candidate is None:
+                        continue
+                    if remaining and not self._is_feasible(remaining):
+                        continue
+                    solution[b] = candidate
+                    if remaining:
+                        solution[a] = remaining
+                    else:
+                        solution.pop(a)  # 路径为空时少用一辆车
+                    return True
+        return False
+
+    def _exchange(self, solution):
+        dist = self._dist
+        for a in range(len(solution)):
+            for b in range(a + 1, len(solution)):
+                route_a, route_b = solution[a], solution[b]
+                path_a, path_b = [0] + route_a + [0], [0] + route_b + [0]
+                for p, u in enumerate(route_a):
+                    prev_a, next_a = path_a[p], path_a[p + 2]
+                    for q, v in enumerate(route_b):
+                        prev_b, next_b = path_b[q], path_b[q + 2]
+                        # 只有与交换位置相邻的弧发生变化
+                        delta = (dist[prev_a][v] + dist[v][next_a] - dist[prev_a][u] - dist[u][next_a]
+                                 + dist[prev_b][u] + dist[u][next_b] - dist[prev_b][v] - dist[v][next_b])
+                        if delta >= -1e-6:
+                            continue
+                        new_a = route_a[:p] + [v] + route_a[p + 1:]
+                        new_b = route_b[:q] + [u] + route_b[q + 1:]
+                        if self._is_feasible(new_a) and self._is_feasible(new_b):
+                            solution[a], solution[b] = new_a, new_b
+                            return True
+        return False
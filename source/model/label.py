@@ -0,0 +1,39 @@
+class Label:
+    """紧凑标签：用 __slots__ 存储资源，visited 为整数位掩码，路径通过父指针回溯"""
+    __slots__ = ("node", "parent", "visited", "n_visited", "max_load", "remaining_load",
+                 "total_delivery", "total_pickup", "total_time", "cost", "reduced_cost", "dominated")
+
+    def __init__(self,
+                 node: int,
+                 parent,
+                 visited: int,
+                 n_visited: int,
+                 max_load: float,
+                 remaining_load: float,
+                 total_delivery: float,
+                 total_pickup: float,
+                 total_time: float,
+                 cost: float,
+                 reduced_cost: float):
+        self.node = node
+        self.parent = parent  # 上一节点的标签（车场初始标签为None）
+        self.visited = visited  # 第i位为1表示已访问客户i（ng-route 松弛下为 ng 记忆）
+        self.n_visited = n_visited  # visited 中的客户数（即visited.bit_count()）
+        self.max_load = max_load  # 途中最大载货量（出发时装载迄今所有客户的配送量，见 PricingSubproblem.extend_label）
+        self.remaining_load = remaining_load  # 离开当前节点时的载货量（即已取货总量）
+        self.total_delivery = total_delivery
+        self.total_pickup = total_pickup
+        self.total_time = total_time
+        self.cost = cost
+        self.reduced_cost = reduced_cost  # 累计缩减成本（不含theta）
+        self.dominated = False  # 入堆后被新标签支配时置为True，出堆时直接跳过
+
+    def path(self):
+        """沿父指针回溯出完整路径"""
+        path = []
+        label = self
+        while label is not None:
+            path.append(label.node)
+            label = label.parent
+        path.reverse()
+        return path
@@ -1,8 +1,11 @@
 from typing import List
+from collections import Counter
 import gurobipy as gp
 from gurobipy import GRB
 import logging
 from ..info.input_data import InputData
+from ..model.column_pool import ColumnPool
+from ..utils import constant, timing
 from ..info.config import Config
 
 class RestrictedMasterProblem:
@@ -10,79 +13,186 @@ class RestrictedMasterProblem:
                  input_data: InputData):
         self.input_data = input_data
         self.model = gp.Model("RMP")
-        self.routes = initial_routes
-        self.lambdas = {}
+        self.model.ModelSense = GRB.MINIMIZE  # 目标系数随列一起加入（addVar 的 obj 参数）
+        self.routes = []  # 所有生成过的列，下标即列编号
+        self.lambdas = {}  # 列编号 -> 变量，只含当前在主问题中的列（被移入侧池的列不在其中）
+        self.column_pool = ColumnPool(purge_rc_threshold=constant.COLUMN_PURGE_RC_THRESHOLD)  # 用于 O(1) 判重与列管理
+        self.iteration = 0  # 主问题已求解的次数；列的加入时间、进入最优基的时间都以此计（初始列为0）
         self.pi = {}
-        self.theta = 0
+        self.theta = 0  # 车辆约束对偶值（分支定价中有车辆数下限约束时为两者之和）
+        self.forbidden_arcs = set()  # 分支定价中当前节点禁止的弧，含禁止弧的列上界为0
+        self.min_vehicles = 0
+        self.max_vehicles = self.input_data.vehicle_info.count
+        self.vehicle_min_constr = None  # 车辆数下限约束，分支定价中按车辆数分支时才建立
+        self.artificial_vars = {}  # 客户 -> 人工变量（分支定价中保证各节点主问题可行）
+        self.artificial_cost = None
         self.num_customers = len(self.input_data.customer_dict)-1
 
-        # 创建变量
-        for idx, route in enumerate(self.routes):
-            self.lambdas[idx] = self.model.addVar(vtype=GRB.CONTINUOUS, name=f"lambda_{idx}",lb=0,ub=1)
-
-        # 目标函数
-        self.model.setObjective(
-            gp.quicksum(route["cost"] * self.lambdas[idx] for idx, route in enumerate(self.routes)),
-            GRB.MINIMIZE
-        )
-
+        # 先建立空约束，列（变量）通过 gp.Column 带着约束系数加入
         # 客户覆盖约束
         self.coverage_constrs = {}
         for i in range(1, self.num_customers + 1):
-            expr = gp.LinExpr()
-            for idx, route in enumerate(self.routes):
-                if i in route["path"][1:-1]:
-                    expr += self.lambdas[idx]
-            self.coverage_constrs[i] = self.model.addConstr(expr == 1, name=f"cover_{i}")
+            self.coverage_constrs[i] = self.model.addConstr(gp.LinExpr() == 1, name=f"cover_{i}")
 
         # 车辆数量约束
         self.vehicle_constr = self.model.addConstr(
-            gp.quicksum(self.lambdas[idx] for idx in range(len(self.routes))) <= self.input_data.vehicle_info.count,
+            gp.LinExpr() <= self.input_data.vehicle_info.count,
             name="vehicle_limit"
         )
 
+        self.add_routes(initial_routes)
+
+    @timing.profiled("主问题求解")
     def solve(self):
         self.model.optimize()
-        self.mp_obj = self.model.ObjVal
         if self.model.status == GRB.OPTIMAL:
-            for i in range(1, self.num_customers + 1):
-                self.pi[i] = self.coverage_constrs[i].Pi
-            self.theta = self.vehicle_constr.Pi
+            self.mp_obj = self.model.ObjVal
+            with timing.section("对偶值提取"):
+                for i in range(1, self.num_customers + 1):
+                    self.pi[i] = self.coverage_constrs[i].Pi
+                self.theta = self.vehicle_constr.Pi
+                if self.vehicle_min_constr is not None:
+                    self.theta += self.vehicle_min_constr.Pi
+                self.iteration += 1
+                indices = list(self.lambdas)
+                lambdas = [self.lambdas[idx] for idx in indices]
+                self.column_pool.update_stats(indices=indices,
+                                              reduced_costs=self.model.getAttr("RC", lambdas),
+                                              basis_status=self.model.getAttr("VBasis", lambdas),
+                                              iteration=self.iteration)
+            logging.info(f"主问题: 列数 {len(self.lambdas)}（侧池 {len(self.column_pool.purged)}）, "
+                         f"求解耗时 {self.model.Runtime:.4f}s, Gurobi内存 {self.model.MemUsed * 1024:.2f}MB")
             return True
+        logging.warning(f"主问题求解状态 {self.model.status}，没有最优解")
         return False
 
     def add_route(self, new_route):
-        for current_route in self.routes:
-            if current_route['path'] == new_route['path']:
+        self.add_routes([new_route])
+
+    @timing.profiled("加入新列")
+    def add_routes(self, new_routes):
+        """批量加入列：每列通过 gp.Column 一次性带上覆盖约束、车辆约束系数与目标系数，最后只调用一次 model.update()"""
+        for new_route in new_routes:
+            if self.is_route_exist(new_route['path']):
                 logging.info("生成重复解，pass")
-                return
-        idx = len(self.routes)
-        self.routes.append(new_route)
-        new_lambda = self.model.addVar(vtype=GRB.CONTINUOUS, name=f"lambda_{idx}",lb=0,ub=1)
-        self.lambdas[idx] = new_lambda
-
-        # 更新目标函数
-        self.model.setObjective(
-            self.model.getObjective() + new_route["cost"] * new_lambda,
-            GRB.MINIMIZE
-        )
+                continue
+            idx = len(self.routes)
+            self.routes.append(new_route)
+            self.column_pool.add(path=new_route['path'], idx=idx, iteration=self.iteration)
+            self._add_column(idx)
 
-        # 更新客户覆盖约束系数
-        for i in range(1, self.num_customers + 1):
-            if i in new_route["path"][1:-1]:
-                self.model.chgCoeff(self.coverage_constrs[i], new_lambda, 1.0)
+        self.model.update()
 
-            # 移除原有车辆约束并重新添加（确保包含新变量）
-        self.model.remove(self.vehicle_constr)  # 移除旧约束
-        self.vehicle_constr = self.model.addConstr(
-            gp.quicksum(self.lambdas[idx] for idx in self.lambdas) <= self.input_data.vehicle_info.count,
-            name="vehicle_limit"
-        )
+    def _add_column(self, idx: int):
+        route = self.routes[idx]
+        # 客户覆盖约束系数（ng-route 松弛下的列可能多次访问同一客户，系数为访问次数）+ 车辆约束系数
+        column = gp.Column()
+        for i, count in Counter(route["path"][1:-1]).items():
+            column.addTerms(count, self.coverage_constrs[i])
+        column.addTerms(1.0, self.vehicle_constr)
+        if self.vehicle_min_constr is not None:
+            column.addTerms(1.0, self.vehicle_min_constr)
+        self.lambdas[idx] = self.model.addVar(vtype=GRB.CONTINUOUS, name=f"lambda_{idx}", lb=0,
+                                              ub=1 if self._is_allowed(idx) else 0,
+                                              obj=route["cost"], column=column)
+
+    def _is_allowed(self, idx: int) -> bool:
+        """列未被停用且不含当前禁止的弧"""
+        if self.column_pool.by_index[idx].disabled:
+            return False
+        if not self.forbidden_arcs:
+            return True
+        path = self.routes[idx]["path"]
+        return not any(arc in self.forbidden_arcs for arc in zip(path, path[1:]))
+
+    def set_branching(self, forbidden_arcs, min_vehicles: int, max_vehicles: int):
+        """
+        设置分支定价节点的分支决策：含禁止弧的列上界设为0，车辆数限制在 [min_vehicles, max_vehicles]
+        :param forbidden_arcs: 禁止使用的弧 {(i, j)}
+        """
+        self.forbidden_arcs = set(forbidden_arcs)
+        for idx, var in self.lambdas.items():
+            var.ub = 1 if self._is_allowed(idx) else 0
+        self.min_vehicles, self.max_vehicles = min_vehicles, max_vehicles
+        self.vehicle_constr.rhs = max_vehicles
+        if min_vehicles > 0 and self.vehicle_min_constr is None:
+            self.vehicle_min_constr = self.model.addConstr(gp.quicksum(self.lambdas.values()) >= min_vehicles,
+                                                           name="vehicle_min")
+        elif self.vehicle_min_constr is not None:
+            self.vehicle_min_constr.rhs = min_vehicles
+        self.model.update()
+
+    def default_artificial_cost(self) -> float:
+        """人工变量成本：每个客户单独成一条路径的总成本的10倍，大于任何可行解"""
+        dist = self.input_data.distance_matrix
+        return 10 * sum(dist[(0, i)] + dist[(i, 0)] for i in self.coverage_constrs) + 1
+
+    def add_artificial_columns(self, cost: float):
+        """
+        为每个覆盖约束加入成本为 cost 的人工变量（大M法），使主问题始终可行：
+        根节点的初始列可能用到超过车辆数的路径，分支定价中分支后的节点可能禁止了初始列。已加入时不再重复加入
+        """
+        if self.artificial_vars:
+            return
+        self.artificial_cost = cost
+        for i, constr in self.coverage_constrs.items():
+            self.artificial_vars[i] = self.model.addVar(vtype=GRB.CONTINUOUS, name=f"artificial_{i}", lb=0, ub=1,
+                                                        obj=cost, column=gp.Column(1.0, constr))
+        self.model.update()
 
+    def reduced_cost(self, route) -> float:
+        """按最近一次求解的对偶值计算列的缩减成本：cost - sum(pi_i) - theta"""
+        return route["cost"] - sum(self.pi[i] for i in route["path"][1:-1]) - self.theta
+
+    def purge_columns(self, max_age: int) -> int:
+        """
+        将连续 max_age 次求解都为非基变量、且缩减成本大于阈值的列移出主问题，放入侧池。
+        初始列始终保留，保证主问题可行。被移除的列取值为0，不影响当前最优解。
+        :return: 移除的列数
+        """
+        purged = [idx for idx in self.lambdas
+                  if self.column_pool.by_index[idx].added_iteration > 0
+                  and self.column_pool.by_index[idx].nonbasic_age >= max_age]
+        if not purged:
+            return 0
+        self.model.remove([self.lambdas.pop(idx) for idx in purged])
+        for idx in purged:
+            self.column_pool.deactivate(idx)
+        self.model.update()
+        logging.info(f"列管理: 移出 {len(purged)} 列到侧池")
+        return len(purged)
+
+    def restore_columns(self, restore_all: bool = False) -> int:
+        """
+        按当前对偶值计算侧池中各列的缩减成本，为负的列重新加入主问题
+        :param restore_all: 为 True 时恢复侧池中所有未停用的列（求整数解前使用）
+        :return: 恢复的列数
+        """
+        restored = []
+        for idx in self.column_pool.purged:
+            if not self._is_allowed(idx):
+                continue
+            if restore_all:
+                restored.append(idx)
+                continue
+            if self.reduced_cost(self.routes[idx]) < -1e-6:
+                restored.append(idx)
+        if not restored:
+            return 0
+        for idx in restored:
+            self.column_pool.activate(idx)
+            self._add_column(idx)
+        self.model.update()
+        logging.info(f"列管理: 从侧池恢复 {len(restored)} 列")
+        return len(restored)
+
+    def disable_routes(self, indices: List[int]):
+        """将指定列的上界设为0（列仍保留在模型中，且移入侧池后不再恢复）"""
+        for idx in indices:
+            self.column_pool.by_index[idx].disabled = True
+            if idx in self.lambdas:
+                self.lambdas[idx].ub = 0
         self.model.update()
 
     def is_route_exist(self, route_path: List[int]):
-        for route in self.routes:
-            if route['path'] == route_path:
-                return True
-        return False
+        return route_path in self.column_pool
@@ -1,13 +1,19 @@
 import logging
-from collections import defaultdict
+import time
+from collections import Counter, defaultdict
 
 import gurobipy as gp
 from gurobipy import GRB
 from ..info.input_data import InputData
 from ..info.config import Config
 from ..model.master_model import RestrictedMasterProblem
-from ..model.sub_model import PricingSubproblem
+from ..model.branch_and_price import BranchAndPrice
+from ..model.column_cache import ColumnCache
+from ..model.dual_stabilization import DualStabilizer
+from ..model.ng_route import NgNeighbourhood
+from ..model.pricing_cascade import PricingCascade
 from ..model.inital_sol import InitialSol
+from ..result.telemetry import IterationTelemetry
 from ..utils import constant,timing
 
 class ModelManager:
@@ -15,82 +21,249 @@ class ModelManager:
                  input_data: InputData,
                  ):
         self.input_data = input_data
-        self.initial_sol = InitialSol(input_data=self.input_data)
-        self.iteration_routes = []  # 用于记录每次迭代的路径集合(为了迭代可视化)
+        with timing.section("初始列池"):
+            self.initial_sol = InitialSol(input_data=self.input_data)
+        # 根节点每次主问题求解的记录 {"iteration", "mp_obj", "active", "added"}，只保存列编号(为了迭代可视化)
+        self.iteration_records = []
+        # ng-route 松弛（constant.NG_NEIGHBOURHOOD_SIZE 为 None 时使用初等路径）
+        self.ng_neighbourhood = NgNeighbourhood(input_data=self.input_data) \
+            if constant.NG_NEIGHBOURHOOD_SIZE else None
+        self.pricing_cascade = PricingCascade(input_data=self.input_data, ng_neighbourhood=self.ng_neighbourhood)
+        self.pricing_levels = []  # 每次迭代找到新列（或确认无新列）的定价层级
+        self.lower_bound = None  # 列生成过程中最好的拉格朗日下界
+        self.bounds = []  # 每次迭代的 (主问题目标值, 拉格朗日下界)，本次迭代无下界时为 None
+        self.dual_stabilizer = DualStabilizer()  # constant.DUAL_STABILIZATION 为 None 时直接使用主问题对偶值
+        # 磁盘列缓存（constant.COLUMN_CACHE_FOLDER 为 None 时不使用）
+        self.column_cache = ColumnCache(input_data=self.input_data) if constant.COLUMN_CACHE_FOLDER else None
+        self.telemetry = None  # 根节点列生成的迭代遥测（constant.CG_METRICS_FORMAT 为 None 时不记录）
 
     @timing.record_time_decorator(task_name="列生成后生成整数解的时长")
     def get_integer_sol(self, rmp):
         imp_route = dict() # 求解整数解
         logging.info("\nSolving integer solution...")
+        rmp.restore_columns(restore_all=True)  # 整数解在所有生成过的列上求解
         for v in rmp.model.getVars():
             v.vtype = GRB.BINARY
         rmp.model.optimize()
-        if rmp.model.status == GRB.OPTIMAL:
-            logging.info("Integer solution:")
-            total_cost = 0
-            for idx, route in enumerate(rmp.routes):
-                if rmp.lambdas[idx].X > 0.5:
-                    imp_route[f"Route {idx}"] = {'cost':route['cost'], 'path': route['path']}
-                    total_cost += route["cost"]
-            logging.info(f"Total Cost: {total_cost}")
-            return imp_route, total_cost
+        if rmp.model.status != GRB.OPTIMAL:
+            logging.warning(f"整数解求解状态 {rmp.model.status}，找不到整数解")
+            return {}, None
+        if any(var.X > 0.5 for var in rmp.artificial_vars.values()):
+            logging.warning("当前列集合上不存在不用人工变量的整数解")
+            return {}, None
+        logging.info("Integer solution:")
+        total_cost = 0
+        for idx, var in rmp.lambdas.items():
+            route = rmp.routes[idx]
+            if var.X > 0.5:
+                imp_route[f"Route {idx}"] = {'cost':route['cost'], 'path': route['path']}
+                total_cost += route["cost"]
+        logging.info(f"Total Cost: {total_cost}")
+        return imp_route, total_cost
+
+    def _lagrangian_bound(self, dual_values):
+        """
+        由精确定价的最小缩减成本计算拉格朗日下界：sum(pi_i) + K * min_j(c_j - sum(pi_i a_ij))，
+        其中 c_j - sum(pi_i a_ij) = 缩减成本 + theta，K 在该值为负时取车辆数上限、否则取车辆数下限；
+        分支定价中还需计入人工变量的 min(0, 人工成本 - pi_i)。本次未运行精确定价时返回 None
+        """
+        min_reduced_cost = self.pricing_cascade.min_reduced_cost
+        if min_reduced_cost is None:
+            return None
+        route_reduced_cost = min(0.0, min_reduced_cost) + dual_values['theta']
+        vehicles = self.rmp.max_vehicles if route_reduced_cost < 0 else self.rmp.min_vehicles
+        bound = sum(dual_values['pi'].values()) + vehicles * route_reduced_cost
+        if self.rmp.artificial_vars:
+            bound += sum(min(0.0, self.rmp.artificial_cost - pi) for pi in dual_values['pi'].values())
+        return bound
+
+    def _grow_ng_neighbourhood(self, positive_routes):
+        """根据主问题解中取正值的列中的环扩展 ng 邻域，返回邻域是否发生变化"""
+        if self.ng_neighbourhood is None:
+            return False
+        cyclic_paths = [route['path'] for route in positive_routes if NgNeighbourhood.find_cycles(route['path'])]
+        if not cyclic_paths or not self.ng_neighbourhood.grow(cyclic_paths):
+            return False
+        self.rmp.disable_routes([idx for idx, route in enumerate(self.rmp.routes)
+                                 if not self.ng_neighbourhood.is_ng_feasible(route['path'])])
+        return True
 
     @timing.record_time_decorator(task_name="列生成迭代的时长")
     def run_cg_model(self):# 创建受限主问题
-        self.rmp = RestrictedMasterProblem(initial_routes=self.initial_sol.initial_routes,
-                                      input_data=self.input_data)
+        initial_routes = list(self.initial_sol.initial_routes)
+        if self.column_cache is not None:
+            # 缓存中在当前参数下仍可行的列与初始列池一起作为初始列
+            known = {tuple(route["path"]) for route in initial_routes}
+            initial_routes += [route for route in self.column_cache.load() if tuple(route["path"]) not in known]
+        with timing.section("主问题建模"):
+            self.rmp = RestrictedMasterProblem(initial_routes=initial_routes,
+                                               input_data=self.input_data)
+            # 初始列池的最好解可能用到超过车辆数的路径，只用初始列时主问题不可行；
+            # 与分支定价的节点一样加入大M人工变量，列生成会把人工变量逐步替换为路径
+            self.rmp.add_artificial_columns(self.rmp.default_artificial_cost())
+
+        if constant.CG_METRICS_FORMAT:
+            self.telemetry = IterationTelemetry(folder=Config().output_folder)
+        try:
+            self.column_generation(root=True)
+        finally:
+            if self.telemetry is not None:
+                self.telemetry.close()
+
+        self.pricing_cascade.log_level_stats()
+        if sum(var.X for var in self.rmp.artificial_vars.values()) > 1e-6:
+            logging.warning("列生成结束时人工变量仍取正值：在当前车辆数下线性松弛不可行")
+
+        # 输出最终解
+        logging.info("\nFinal solution (Linear Relaxation):")
+        for idx, var in self.rmp.lambdas.items():
+            route = self.rmp.routes[idx]
+            if var.X > 0.01:
+                logging.info(f"Route {idx}: {route['path']}, Cost: {route['cost']}, Lambda: {var.X:.2f}")
 
-        # 记录初始路径集合(为了迭代可视化)
-        self.iteration_routes.append(self.rmp.routes.copy())
+        if constant.BRANCH_AND_PRICE:
+            self.imp_routes, self.imp_total_cost = BranchAndPrice(model_manager=self).solve()
+        else:
+            self.imp_routes, self.imp_total_cost = self.get_integer_sol(rmp=self.rmp)
+        if self.column_cache is not None:
+            column_pool = self.rmp.column_pool
+            used_paths = [route["path"] for idx, route in enumerate(self.rmp.routes)
+                          if column_pool.by_index[idx].added_iteration > 0 or column_pool.by_index[idx].basis_count > 0]
+            used_paths += [route["path"] for route in (self.imp_routes or {}).values()]
+            self.column_cache.save(self.rmp.routes, used_paths=used_paths)
+        self.pricing_cascade.shutdown()
 
+    def column_generation(self, root: bool = True, cutoff: float = None):
+        """
+        在当前主问题上迭代求解主问题与定价子问题
+        :param root: 是否为根节点的列生成；分支定价的节点上不受 MAX_ITERATION 与 CG_RELATIVE_GAP 限制（求解到最优），
+                     也不记录迭代可视化与每次迭代的上下界
+        :param cutoff: 拉格朗日下界不小于该值时提前终止（分支定价中为当前最好整数解的成本）
+        :return: (状态, 拉格朗日下界)，状态为 "optimal"（定价找不到新列）、"stopped"（达到迭代次数或间隙）、
+                 "cutoff"（下界不小于 cutoff）或 "infeasible"（主问题无解）
+        """
+        self.dual_stabilizer.reset()
+        lower_bound = None
+        telemetry = self.telemetry if root else None
         # 列生成迭代
         iteration = 0
         while True:
             logging.info(f"\n=== Column Generation Iteration {iteration} ===")
-
-            # 1. 求解主问题（RMP）
-            if not self.rmp.solve():
-                break  # 主问题无解
-            # 2. 创建定价子问题并求解所有可行路径
-            self.psp = PricingSubproblem(input_data=self.input_data,
-                                         dual_values={'pi': self.rmp.pi,
-                                                      'theta': self.rmp.theta})
-            feasible_routes = self.psp.solve()  # 获取所有缩减成本<0的路径
-
-            # 3. 终止条件：没有新路径或所有路径不满足缩减成本要求
-            if not feasible_routes:
-                logging.info("No new routes found. Terminating.")
-                break
-
-            # 4. 过滤并添加新路径到主问题
-            routes_added = False # (为了迭代可视化)
-            for route in feasible_routes:
-                # 检查路径是否已存在（避免重复添加）
-                if self.rmp.is_route_exist(route['path']):
+            if telemetry is not None:
+                telemetry.begin(iteration=iteration, columns_added=0, columns_restored=0)
+            try:
+                # 1. 求解主问题（RMP）
+                st = time.perf_counter()
+                if not self.rmp.solve():
+                    return "infeasible", lower_bound  # 主问题无解
+                if telemetry is not None:
+                    telemetry.update(rmp_obj=self.rmp.mp_obj, rmp_time=time.perf_counter() - st,
+                                     pool_size=len(self.rmp.routes), rmp_columns=len(self.rmp.lambdas),
+                                     purged_columns=len(self.rmp.column_pool.purged))
+                if root:
+                    # 记录本次主问题解中取正值的列，本轮定价加入的列在加入后补上(为了迭代可视化)
+                    record = {"iteration": iteration, "mp_obj": self.rmp.mp_obj, "added": (),
+                              "active": tuple(idx for idx, var in self.rmp.lambdas.items() if var.X > 1e-6)}
+                    self.iteration_records.append(record)
+                if root and constant.MAX_ITERATION is not None and iteration >= constant.MAX_ITERATION:
+                    logging.warning(f"达到最大迭代次数 {constant.MAX_ITERATION}，停止列生成：主问题目标值 {self.rmp.mp_obj:.4f} "
+                                    f"不是线性松弛的最优值，整数解只在当前列集合上求解")
+                    return "stopped", lower_bound
+                positive_routes = [self.rmp.routes[idx] for idx, var in self.rmp.lambdas.items() if var.X > 1e-6]
+                # ng-route：主问题解中含环的列说明邻域过小，扩展邻域并停用不再满足 ng 规则的列后重新求解主问题
+                ng_grown = self._grow_ng_neighbourhood(positive_routes)
+                # 列管理：侧池中缩减成本重新变负的列直接恢复，本轮不再定价
+                restored = self.rmp.restore_columns()
+                if restored:
+                    if telemetry is not None:
+                        telemetry.update(columns_restored=restored)
+                    iteration += 1
                     continue
+                # 2. 定价级联：先用启发式求负缩减成本路径，均失败时再运行精确标签算法（在稳定化后的分离点处定价）
+                # 设置了提前终止间隙时每次迭代都运行精确定价以得到拉格朗日下界，否则只在启发式定价失败时得到下界
+                exact_only = root and constant.CG_RELATIVE_GAP is not None
+                st = time.perf_counter()
+                dual_values = self.dual_stabilizer.separation_point(pi=self.rmp.pi, theta=self.rmp.theta)
+                feasible_routes, level = self.pricing_cascade.solve(dual_values=dual_values,
+                                                                    base_routes=positive_routes,
+                                                                    is_existing=self.rmp.is_route_exist,
+                                                                    exact_only=exact_only)
+                label_stats = Counter(self.pricing_cascade.label_stats)
+                # 误定价：分离点处的新列对主问题对偶值的缩减成本都不为负，回到主问题对偶值重新定价
+                if self.dual_stabilizer.active and \
+                        not any(self.rmp.reduced_cost(route) < -1e-6 for route in feasible_routes):
+                    dual_values = self.dual_stabilizer.mispriced(pi=self.rmp.pi, theta=self.rmp.theta)
+                    feasible_routes, level = self.pricing_cascade.solve(dual_values=dual_values,
+                                                                        base_routes=positive_routes,
+                                                                        is_existing=self.rmp.is_route_exist,
+                                                                        exact_only=exact_only)
+                    label_stats.update(self.pricing_cascade.label_stats)
+                pricing_time = time.perf_counter() - st
+                self.psp = self.pricing_cascade.psp
+                self.pricing_levels.append(level)
+                logging.info(f"Iteration {iteration} pricing level: {level}")
 
-                # 检查缩减成本是否足够小（避免数值误差误判）
-                if route["reduced_cost"] < -1e-6:
-                    logging.info(
-                        f"Adding route: {route['path']}, "
-                        f"Reduced Cost: {route['reduced_cost']:.2f}"
-                    )
-                    self.rmp.add_route(route)
-                    routes_added = True# (为了迭代可视化)
-
-            # (为了迭代可视化)
-            if routes_added:
-                # 只有在添加了新路径时才记录当前迭代的路径集合
-                self.iteration_routes.append(self.rmp.routes.copy())
+                # 拉格朗日下界与相对间隙，间隙足够小时提前终止
+                bound = self._lagrangian_bound(dual_values)
+                if bound is not None and (lower_bound is None or bound > lower_bound):
+                    lower_bound = bound
+                if root:
+                    self.lower_bound = lower_bound
+                    self.bounds.append((self.rmp.mp_obj, bound))
+                if telemetry is not None:
+                    telemetry.update(lagrangian_bound=bound, best_bound=lower_bound, pricing_level=level,
+                                     pricing_time=pricing_time, labels_created=label_stats["created"],
+                                     labels_dominated=label_stats["dominated"] + label_stats["removed"],
+                                     labels_extended=label_stats["extended"])
+                if lower_bound is None:
+                    logging.info(f"Iteration {iteration} 主问题目标值: {self.rmp.mp_obj:.4f}, 拉格朗日下界: -")
+                else:
+                    gap = (self.rmp.mp_obj - lower_bound) / max(abs(self.rmp.mp_obj), 1e-9)
+                    logging.info(f"Iteration {iteration} 主问题目标值: {self.rmp.mp_obj:.4f}, "
+                                 f"拉格朗日下界: {lower_bound:.4f}, 相对间隙: {gap:.4%}")
+                    if not ng_grown:
+                        if root and constant.CG_RELATIVE_GAP is not None and gap <= constant.CG_RELATIVE_GAP:
+                            logging.info(f"相对间隙不超过 {constant.CG_RELATIVE_GAP:.4%}，提前终止列生成")
+                            return "stopped", lower_bound
+                        if cutoff is not None and lower_bound >= cutoff - 1e-6:
+                            logging.info("拉格朗日下界不小于当前最好整数解，提前终止列生成")
+                            return "cutoff", lower_bound
 
-            iteration += 1
-
-        # 输出最终解
-        logging.info("\nFinal solution (Linear Relaxation):")
-        for idx, route in enumerate(self.rmp.routes):
-            if self.rmp.lambdas[idx].X > 0.01:
-                logging.info(f"Route {idx}: {route['path']}, Cost: {route['cost']}, Lambda: {self.rmp.lambdas[idx].X:.2f}")
+                # 3. 终止条件：没有新路径或所有路径不满足缩减成本要求
+                if not feasible_routes:
+                    if ng_grown:
+                        iteration += 1
+                        continue
+                    logging.info("No new routes found. Terminating.")
+                    return "optimal", lower_bound
 
-        self.imp_routes, self.imp_total_cost = self.get_integer_sol(rmp=self.rmp)
+                # 4. 过滤新路径，本轮的所有新列一次性加入主问题
+                new_routes = []
+                for route in feasible_routes:
+                    # 检查路径是否已存在（避免重复添加）
+                    if self.rmp.is_route_exist(route['path']):
+                        continue
 
+                    # 检查缩减成本是否足够小（避免数值误差误判）
+                    if route["reduced_cost"] < -1e-6:
+                        logging.info(
+                            f"Adding route: {route['path']}, "
+                            f"Reduced Cost: {route['reduced_cost']:.2f}"
+                        )
+                        new_routes.append(route)
+                # 列管理：长期为非基变量且缩减成本较大的列移入侧池
+                if constant.COLUMN_PURGE_AGE:
+                    self.rmp.purge_columns(max_age=constant.COLUMN_PURGE_AGE)
+                num_columns = len(self.rmp.routes)
+                self.rmp.add_routes(new_routes)
+                if root:
+                    # 新列的编号从加入前的列数开始连续分配(为了迭代可视化)
+                    record["added"] = tuple(range(num_columns, len(self.rmp.routes)))
+                if telemetry is not None:
+                    telemetry.update(columns_added=len(self.rmp.routes) - num_columns)
 
+                iteration += 1
+            finally:
+                # 本次迭代（主问题、定价与加入新列）结束时写出遥测记录，提前返回或出错时也写出
+                if telemetry is not None:
+                    telemetry.end()
@@ -0,0 +1,76 @@
+import logging
+from ..info.input_data import InputData
+from ..utils import constant
+
+
+class NgNeighbourhood:
+    """
+    ng-route 松弛的邻域：每个客户只"记住"离它最近的若干客户是否已被访问，
+    路径可以重复访问不在记忆中的客户，从而大幅减少标签数。邻域越大，下界越接近初等路径，定价越慢。
+    """
+
+    def __init__(self, input_data: InputData, size: int = None, max_size: int = None):
+        """
+        :param input_data: InputData 实例
+        :param size: 初始邻域大小（含客户自身），默认取 constant.NG_NEIGHBOURHOOD_SIZE
+        :param max_size: 动态扩展的邻域大小上限，默认取 constant.NG_MAX_NEIGHBOURHOOD_SIZE（None 为不设上限）
+        """
+        self.customers = [i for i in input_data.customer_dict if i != 0]
+        self.size = size or constant.NG_NEIGHBOURHOOD_SIZE
+        self.max_size = max_size or constant.NG_MAX_NEIGHBOURHOOD_SIZE or len(self.customers)
+        # 客户自身 + 按 distance_matrix 最近的 size - 1 个客户
+        self.neighbours = {}
+        for i in self.customers:
+            nearest = sorted((j for j in self.customers if j != i),
+                             key=lambda j: input_data.distance_matrix[(i, j)])
+            self.neighbours[i] = {i, *nearest[:self.size - 1]}
+        self.masks = []
+        self._update_masks()
+
+    def _update_masks(self):
+        """第i项为节点i的邻域位掩码（车场为0）"""
+        self.masks = [0] * (max(self.customers, default=0) + 1)
+        for i, neighbours in self.neighbours.items():
+            for j in neighbours:
+                self.masks[i] |= 1 << j
+
+    @staticmethod
+    def find_cycles(path):
+        """返回路径中的所有环 (客户, 环内经过的节点)，环内节点为两次访问该客户之间的节点"""
+        cycles = []
+        last_position = {}
+        for pos, node in enumerate(path):
+            if node == 0:
+                continue
+            if node in last_position:
+                cycles.append((node, path[last_position[node] + 1:pos]))
+            last_position[node] = pos
+        return cycles
+
+    def is_ng_feasible(self, path) -> bool:
+        """检查路径在当前邻域下是否为 ng-route（不会再次访问仍在记忆中的客户）"""
+        memory = 0
+        for node in path[1:-1]:
+            if memory >> node & 1:
+                return False
+            memory = memory & self.masks[node] | 1 << node
+        return True
+
+    def grow(self, paths) -> int:
+        """
+        对路径中的每个环 i -> ... -> i，把 i 加入环内各节点的邻域，使该环在之后的定价中不可再生成。
+        :return: 新加入邻域的 (节点, 客户) 对的数量
+        """
+        added = 0
+        for path in paths:
+            for customer, inner_nodes in self.find_cycles(path):
+                for node in inner_nodes:
+                    neighbours = self.neighbours[node]
+                    if customer not in neighbours and len(neighbours) < self.max_size:
+                        neighbours.add(customer)
+                        added += 1
+        if added:
+            self._update_masks()
+            logging.info(f"ng-route 邻域扩展: 新增 {added} 个记忆客户, "
+                         f"最大邻域 {max(len(n) for n in self.neighbours.values())}")
+        return added
@@ -9,6 +9,20 @@ from ..info.config import Config
 
 
 class OriginModel:
+    """
+    直接求解的原问题模型，两种建模方式（constant.ORIGIN_MODEL_FORMULATION）：
+    - three_index：按车辆编号的三下标模型 x[i, j, k]，载货量与离开各节点的累计时间用大M约束递推（时间递推消除子回路），
+      可加对称性破除约束；
+    - two_index：两下标车辆流模型 x[i, j]，用弧上的取货/配送载货流量与累计时间流量代替车辆编号与大M约束，
+      变量数与约束数为 O(n^2)
+    两种方式与列生成定价（extend_label）的规则相同：车辆从车场出发时装载所服务客户的全部配送量，
+    离开每个节点时的实际载货量都不超过 Q，在途时间不计车场服务时间，因此三者的最优值一致。
+    两种方式都只在弧预处理后的可行弧上建变量。constant.ORIGIN_MODEL_BUILD 为 "batched" 时约束用 addConstrs 生成器、
+    tupledict.sum/prod 与 LinExpr(系数, 变量) + addLConstr 批量构造，"loop" 为逐个 addConstr 的原始写法，两者建出的模型相同
+    """
+    FORMULATIONS = ("three_index", "two_index")
+    BUILD_MODES = ("batched", "loop")
+
     def __init__(self,
                  input_data: InputData):
         """
@@ -21,22 +35,52 @@ class OriginModel:
         self.customers_id = [k for (k, customer_info) in self.input_data.customer_dict.items() if k != self.depot_id]
         self.K = list(range(input_data.vehicle_info.count))   # 车辆集合动态生成
         self.Q = self.input_data.vehicle_info.capacity
+        self.formulation = constant.ORIGIN_MODEL_FORMULATION
+        if self.formulation not in self.FORMULATIONS:
+            raise ValueError(f"未知的原问题建模方式: {self.formulation}")
+        self.build_mode = constant.ORIGIN_MODEL_BUILD
+        if self.build_mode not in self.BUILD_MODES:
+            raise ValueError(f"未知的原问题构造方式: {self.build_mode}")
 
         # 创建Gurobi模型
         self.model = gp.Model("VRPSPD_Origin")
 
+    @timing.record_time_decorator(task_name="原始模型的建模时长")
     def initialize(self):
         # 数据结构初始化
         self._init_sets()
         self._init_parameters()
-        self._create_variables()
-        self._add_constraints()
+        batched = self.build_mode == "batched"
+        if self.formulation == "two_index":
+            self._create_two_index_variables()
+            if batched:
+                self._add_two_index_constraints_batched()
+            else:
+                self._add_two_index_constraints()
+        else:
+            self._create_variables()
+            if batched:
+                self._add_constraints_batched()
+            else:
+                self._add_constraints()
         self._set_objective()
+        self.model.update()
+        logging.info(f"原始模型（{self.formulation}）: 变量 {self.model.NumVars}, 约束 {self.model.NumConstrs}")
 
     def _init_sets(self):
         """初始化基本集合"""
         self.V = [self.depot_id] + self.customers_id  # 所有节点
         self.N = self.customers_id  # 客户节点
+        # 可行弧（不含自环）：取 InputData 的弧预处理结果；预处理所用的最大在途时间小于当前值时不能使用，保留所有弧
+        if self.input_data.arc_time_limit >= constant.MAX_TRAVEL_TIME:
+            self.A = [(i, j) for i in self.V for j in self.input_data.successors[i]]
+        else:
+            self.A = [(i, j) for i in self.V for j in self.V if i != j]
+        self.out_nodes = {i: [] for i in self.V}  # 每个节点的可行后继
+        self.in_nodes = {i: [] for i in self.V}  # 每个节点的可行前驱
+        for i, j in self.A:
+            self.out_nodes[i].append(j)
+            self.in_nodes[j].append(i)
 
     def _init_parameters(self):
         """初始化模型参数"""
@@ -61,15 +105,15 @@ class OriginModel:
 
     def _create_variables(self):
         """创建决策变量"""
-        # 路径选择变量（三维字典）
+        # 路径选择变量（三维字典），只建可行弧；车场自环 (0, 0) 表示车辆不出车
         self.x = self.model.addVars(
             [(i, j, k) for k in self.K
-             for i in self.V
-             for j in self.V if i == 0 or (i!= 0 and i != j)],
+             for (i, j) in [(self.depot_id, self.depot_id)] + self.A],
             vtype=GRB.BINARY,
             name="x"
         )
-        logging.info("var 'variables_x' has been created")
+        num_pruned = len(self.V) * (len(self.V) - 1) - len(self.A)
+        logging.info(f"var 'variables_x' has been created: {len(self.x)} 个变量, 弧预处理剔除 {num_pruned} 条弧")
 
         # 载货量变量（二维字典）
         self.u = self.model.addVars(
@@ -81,6 +125,16 @@ class OriginModel:
         )
         logging.info("var 'variables_u' has been created")
 
+        # 离开各节点时的累计在途时间（车场为0），用于消除子回路
+        self.t = self.model.addVars(
+            [(i, k) for k in self.K for i in self.V],
+            lb=0,
+            ub={(i, k): 0 if i == self.depot_id else self.tm for k in self.K for i in self.V},
+            vtype=GRB.CONTINUOUS,
+            name="t"
+        )
+        logging.info("var 'variables_t' has been created")
+
     def _add_constraints(self):
         """添加所有约束条件"""
         self._add_visit_constraints()  # 约束1
@@ -90,6 +144,64 @@ class OriginModel:
         self._add_capacity_constraints()  # 约束5
         self._add_initial_load_constraints()
         self._add_travel_time_constraints()
+        if constant.ORIGIN_SYMMETRY_BREAKING:
+            self._add_symmetry_breaking()
+        self._add_subtour_elimination()  # 约束9
+
+    def _add_constraints_batched(self):
+        """与 _add_constraints 相同的约束1-9，按类批量构造"""
+        x, u, t, depot, model = self.x, self.u, self.t, self.depot_id, self.model
+        # 约束1：每个客户被访问一次
+        model.addConstrs((x.sum(i, '*', '*') == 1 for i in self.N), name="visit")
+        # 约束2：流平衡（不含车场自环）
+        model.addConstrs(
+            (gp.LinExpr([1.0] * len(self.out_nodes[i]) + [-1.0] * len(self.in_nodes[i]),
+                        [x[i, j, k] for j in self.out_nodes[i]] + [x[j, i, k] for j in self.in_nodes[i]]) == 0
+             for k in self.K for i in self.V),
+            name="flow"
+        )
+        # 约束3：车辆从depot出发并返回（含车场自环）
+        model.addConstrs((x.sum(depot, '*', k) == 1 for k in self.K), name="depart")
+        model.addConstrs((x.sum('*', depot, k) == 1 for k in self.K), name="return")
+        # 约束4：载货量递推（线性化），u_j - u_i - M * x_ijk >= q_plus_j - q_minus_j - M 及对应的上界；
+        # 约束数为 O(K * n^2)，直接用 addLConstr 添加预先构造的 LinExpr，省去 addConstrs 解析生成器与 TempConstr 的开销
+        M = self.Q
+        for k in self.K:
+            for i, j in self.A:
+                if j == depot:
+                    continue
+                net_load = self.q_plus[j] - self.q_minus[j]
+                model.addLConstr(gp.LinExpr([1.0, -1.0, -M], [u[j, k], u[i, k], x[i, j, k]]),
+                                 GRB.GREATER_EQUAL, net_load - M, f"load_lb_{i}_{j}_{k}")
+                model.addLConstr(gp.LinExpr([1.0, -1.0, M], [u[j, k], u[i, k], x[i, j, k]]),
+                                 GRB.LESS_EQUAL, net_load + M, f"load_ub_{i}_{j}_{k}")
+        # 约束5：载重限制
+        model.addConstrs((u[i, k] <= self.Q for k in self.K for i in self.V), name="cap")
+        # 约束6：初始载货量等于所服务客户的配送量之和
+        delivery_coef = {(i, j, k): self.q_minus[i] for (i, j, k) in x.keys() if i != depot}
+        model.addConstrs((u[depot, k] == x.prod(delivery_coef, '*', '*', k) for k in self.K), name="initial_load")
+        # 约束7：在途时间（行驶时间 + 客户服务时间）
+        time_coef = {(i, j, k): self.input_data.distance_matrix[i, j] / self.v + (self.st[i] if i != depot else 0)
+                     for (i, j, k) in x.keys() if i != j}
+        model.addConstrs((x.prod(time_coef, '*', '*', k) <= self.tm for k in self.K), name="max_travel_time")
+        # 约束8：对称性破除
+        if constant.ORIGIN_SYMMETRY_BREAKING:
+            model.addConstrs((x[depot, depot, k] <= x[depot, depot, k + 1] for k in self.K[:-1]), name="vehicle_order")
+            model.addConstrs(
+                (gp.quicksum(x.sum(i, '*', k) for k in self.K if k > p) == 0
+                 for p, i in enumerate(self.N) if p < len(self.K) - 1),
+                name="customer_vehicle"
+            )
+        # 约束9：累计在途时间递推（线性化），t_j - t_i - M_ij * x_ijk >= 行驶时间 + 服务时间 - M_ij
+        for k in self.K:
+            for i, j in self.A:
+                if j == depot:
+                    continue
+                duration = self.input_data.distance_matrix[i, j] / self.v + self.st[j]
+                big_m = self.tm + duration
+                model.addLConstr(gp.LinExpr([1.0, -1.0, -big_m], [t[j, k], t[i, k], x[i, j, k]]),
+                                 GRB.GREATER_EQUAL, duration - big_m, f"time_order_{i}_{j}_{k}")
+        logging.info("constr 'add_constraints_batched' has been finished")
 
     def _add_visit_constraints(self):
         """约束1：每个客户被访问一次"""
@@ -97,7 +209,7 @@ class OriginModel:
             self.model.addConstr(
                 gp.quicksum(self.x[i, j, k]
                             for k in self.K
-                            for j in self.V if j != i
+                            for j in self.out_nodes[i]
                             ) == 1,
                 f"visit_{i}"
             )
@@ -108,8 +220,8 @@ class OriginModel:
         for k in self.K:
             for i in self.V:  # 仅客户节点需要平衡
                 self.model.addConstr(
-                    gp.quicksum(self.x[i, j, k] for j in self.V if j != i) ==
-                    gp.quicksum(self.x[j, i, k] for j in self.V if j != i),
+                    gp.quicksum(self.x[i, j, k] for j in self.out_nodes[i]) ==
+                    gp.quicksum(self.x[j, i, k] for j in self.in_nodes[i]),
                     f"flow_{i}_{k}"
                 )
         logging.info(f"constr 'add_flow_balance' has been finished")
@@ -119,12 +231,12 @@ class OriginModel:
         for k in self.K:
             # 出发约束
             self.model.addConstr(
-                gp.quicksum(self.x[self.depot_id, j, k] for j in self.V) == 1,
+                gp.quicksum(self.x[self.depot_id, j, k] for j in [self.depot_id] + self.out_nodes[self.depot_id]) == 1,
                 f"depart_{k}"
             )
             # 返回约束
             self.model.addConstr(
-                gp.quicksum(self.x[j, self.depot_id, k] for j in self.V) == 1,
+                gp.quicksum(self.x[j, self.depot_id, k] for j in [self.depot_id] + self.in_nodes[self.depot_id]) == 1,
                 f"return_{k}"
             )
 
@@ -134,20 +246,19 @@ class OriginModel:
         """约束4：载货量递推（线性化）"""
         M = self.Q # 大M值取车辆容量
         for k in self.K:
-            for i in self.V:
-                for j in self.N:
-                    if i == j:
-                        continue
-                    self.model.addConstr(
-                        self.u[j, k] >= self.u[i, k] + self.q_plus[j] - self.q_minus[j]
-                        - M * (1 - self.x[i, j, k]),
-                        f"load_lb_{i}_{j}_{k}"
-                    )
-                    self.model.addConstr(
-                        self.u[j, k] <= self.u[i, k] + self.q_plus[j] - self.q_minus[j]
-                        + M * (1 - self.x[i, j, k]),
-                        f"load_ub_{i}_{j}_{k}"
-                    )
+            for i, j in self.A:
+                if j == self.depot_id:
+                    continue
+                self.model.addConstr(
+                    self.u[j, k] >= self.u[i, k] + self.q_plus[j] - self.q_minus[j]
+                    - M * (1 - self.x[i, j, k]),
+                    f"load_lb_{i}_{j}_{k}"
+                )
+                self.model.addConstr(
+                    self.u[j, k] <= self.u[i, k] + self.q_plus[j] - self.q_minus[j]
+                    + M * (1 - self.x[i, j, k]),
+                    f"load_ub_{i}_{j}_{k}"
+                )
         logging.info("constr 'add_load_consistency' has been finished")
 
     def _add_capacity_constraints(self):
@@ -169,7 +280,7 @@ class OriginModel:
         for k in self.K:
             self.model.addConstr(
                 self.u[self.depot_id, k] == gp.quicksum(
-                    self.q_minus[i] * sum(self.x[i, j, k] for j in self.V if i != j) for i in self.N),
+                    self.q_minus[i] * sum(self.x[i, j, k] for j in self.out_nodes[i]) for i in self.N),
                 f"initial_load_{k}"
             )
         logging.info("constr 'add_initial_load_constraints' has been finished")
@@ -181,14 +292,12 @@ class OriginModel:
             # 计算总行驶时间（距离/速度）
             travel_time = gp.quicksum(
                 (self.input_data.distance_matrix[i, j] / self.v) * self.x[i, j, k]
-                for i in self.V
-                for j in self.V
-                if i != j
+                for (i, j) in self.A
             )
 
             # 计算总服务时间（仅客户节点）
             service_time = gp.quicksum(
-                self.st[i] * gp.quicksum(self.x[i, j, k] for j in self.V if j != i)
+                self.st[i] * gp.quicksum(self.x[i, j, k] for j in self.out_nodes[i])
                 for i in self.N
             )
 
@@ -200,14 +309,142 @@ class OriginModel:
         logging.info("constr 'add_travel_time_constraints' has been finished")
 
 
+    def _add_symmetry_breaking(self):
+        """
+        约束8：对称性破除。把路径按其访问的客户在 N 中的最小序号排序后依次分给车辆 0, 1, ...，不出车的车辆排在最后：
+        车辆 k 不出车则车辆 k+1 也不出车；N 中第 p 个客户（从0计）只能由编号不大于 p 的车辆服务
+        """
+        for k in self.K[:-1]:
+            self.model.addConstr(
+                self.x[self.depot_id, self.depot_id, k] <= self.x[self.depot_id, self.depot_id, k + 1],
+                f"vehicle_order_{k}"
+            )
+        for p, i in enumerate(self.N):
+            later_vehicles = [k for k in self.K if k > p]
+            if not later_vehicles:
+                continue
+            self.model.addConstr(
+                gp.quicksum(self.x[i, j, k] for k in later_vehicles for j in self.out_nodes[i]) == 0,
+                f"customer_vehicle_{i}"
+            )
+        logging.info("constr 'add_symmetry_breaking' has been finished")
+
+    def _add_subtour_elimination(self):
+        """
+        约束9：离开各节点的累计在途时间递推（线性化）。客户间的行驶时间与服务时间为正，沿路径严格递增，
+        因此不与车场相连的子回路不可行（载货递推不能消除取货与配送相抵的子回路）
+        """
+        for k in self.K:
+            for i, j in self.A:
+                if j == self.depot_id:
+                    continue
+                duration = self.input_data.distance_matrix[i, j] / self.v + self.st[j]
+                big_m = self.tm + duration  # x_ijk = 0 时约束不起作用
+                self.model.addConstr(
+                    self.t[j, k] >= self.t[i, k] + duration - big_m * (1 - self.x[i, j, k]),
+                    f"time_order_{i}_{j}_{k}"
+                )
+        logging.info("constr 'add_subtour_elimination' has been finished")
+
+    def _create_two_index_variables(self):
+        """两下标模型的决策变量：弧选择 x[i, j]、弧上的取货载货量 y[i, j] 与待配送载货量 z[i, j]、到达 j 时的累计在途时间 w[i, j]"""
+        self.x = self.model.addVars(self.A, vtype=GRB.BINARY, name="x")
+        # 离开车场时尚未取货，回到车场时已无待配送货物
+        self.y = self.model.addVars(self.A, lb=0, ub={(i, j): 0 if i == self.depot_id else self.Q for i, j in self.A},
+                                    vtype=GRB.CONTINUOUS, name="y")
+        self.z = self.model.addVars(self.A, lb=0, ub={(i, j): 0 if j == self.depot_id else self.Q for i, j in self.A},
+                                    vtype=GRB.CONTINUOUS, name="z")
+        self.w = self.model.addVars(self.A, lb=0, ub=self.tm, vtype=GRB.CONTINUOUS, name="w")
+        num_pruned = len(self.V) * (len(self.V) - 1) - len(self.A)
+        logging.info(f"var 'variables_x/y/z/w' has been created: 每类 {len(self.x)} 个变量, 弧预处理剔除 {num_pruned} 条弧")
+
+    def _add_two_index_constraints(self):
+        """两下标车辆流模型的约束：每个客户进出各一次、车辆数上限、取货/配送/时间流量守恒、弧上载货量与时间上下界"""
+        travel = lambda i, j: self.input_data.distance_matrix[i, j] / self.v
+        for i in self.N:
+            self.model.addConstr(gp.quicksum(self.x[i, j] for j in self.out_nodes[i]) == 1, f"visit_out_{i}")
+            self.model.addConstr(gp.quicksum(self.x[j, i] for j in self.in_nodes[i]) == 1, f"visit_in_{i}")
+            # 经过客户 i 后取货载货量增加 q_plus，待配送载货量减少 q_minus
+            self.model.addConstr(
+                gp.quicksum(self.y[i, j] for j in self.out_nodes[i])
+                - gp.quicksum(self.y[j, i] for j in self.in_nodes[i]) == self.q_plus[i],
+                f"pickup_flow_{i}"
+            )
+            self.model.addConstr(
+                gp.quicksum(self.z[j, i] for j in self.in_nodes[i])
+                - gp.quicksum(self.z[i, j] for j in self.out_nodes[i]) == self.q_minus[i],
+                f"delivery_flow_{i}"
+            )
+            # 累计时间增加 服务时间 + 离开 i 的弧的行驶时间（同时消除子回路）
+            self.model.addConstr(
+                gp.quicksum(self.w[i, j] for j in self.out_nodes[i])
+                - gp.quicksum(self.w[j, i] for j in self.in_nodes[i])
+                == gp.quicksum((self.st[i] + travel(i, j)) * self.x[i, j] for j in self.out_nodes[i]),
+                f"time_flow_{i}"
+            )
+        self.model.addConstr(
+            gp.quicksum(self.x[self.depot_id, j] for j in self.out_nodes[self.depot_id]) <= len(self.K), "fleet"
+        )
+        for i, j in self.A:
+            self.model.addConstr(self.y[i, j] + self.z[i, j] <= self.Q * self.x[i, j], f"arc_cap_{i}_{j}")
+            if i == self.depot_id:
+                self.model.addConstr(self.w[i, j] == travel(i, j) * self.x[i, j], f"time_start_{j}")
+            else:
+                earliest = travel(self.depot_id, i) + self.st[i] + travel(i, j)
+                self.model.addConstr(self.w[i, j] >= earliest * self.x[i, j], f"time_lb_{i}_{j}")
+            latest = self.tm if j == self.depot_id else self.tm - self.st[j] - travel(j, self.depot_id)
+            self.model.addConstr(self.w[i, j] <= latest * self.x[i, j], f"time_ub_{i}_{j}")
+        logging.info("constr 'add_two_index_constraints' has been finished")
+
+    def _add_two_index_constraints_batched(self):
+        """与 _add_two_index_constraints 相同的约束，按类批量构造"""
+        x, y, z, w, depot, model = self.x, self.y, self.z, self.w, self.depot_id, self.model
+        travel = {(i, j): self.input_data.distance_matrix[i, j] / self.v for i in self.V for j in self.V}
+        out_nodes, in_nodes = self.out_nodes, self.in_nodes
+        model.addConstrs((x.sum(i, '*') == 1 for i in self.N), name="visit_out")
+        model.addConstrs((x.sum('*', i) == 1 for i in self.N), name="visit_in")
+        model.addConstrs((y.sum(i, '*') - y.sum('*', i) == self.q_plus[i] for i in self.N), name="pickup_flow")
+        model.addConstrs((z.sum('*', i) - z.sum(i, '*') == self.q_minus[i] for i in self.N), name="delivery_flow")
+        model.addConstrs(
+            (gp.LinExpr([1.0] * len(out_nodes[i]) + [-1.0] * len(in_nodes[i])
+                        + [-(self.st[i] + travel[i, j]) for j in out_nodes[i]],
+                        [w[i, j] for j in out_nodes[i]] + [w[j, i] for j in in_nodes[i]]
+                        + [x[i, j] for j in out_nodes[i]]) == 0
+             for i in self.N),
+            name="time_flow"
+        )
+        model.addConstr(x.sum(depot, '*') <= len(self.K), "fleet")
+        # 逐弧的约束直接用 addLConstr 添加预先构造的 LinExpr
+        for i, j in self.A:
+            model.addLConstr(gp.LinExpr([1.0, 1.0, -self.Q], [y[i, j], z[i, j], x[i, j]]), GRB.LESS_EQUAL, 0,
+                             f"arc_cap_{i}_{j}")
+            if i == depot:
+                model.addLConstr(gp.LinExpr([1.0, -travel[i, j]], [w[i, j], x[i, j]]), GRB.EQUAL, 0,
+                                 f"time_start_{j}")
+            else:
+                earliest = travel[depot, i] + self.st[i] + travel[i, j]
+                model.addLConstr(gp.LinExpr([1.0, -earliest], [w[i, j], x[i, j]]), GRB.GREATER_EQUAL, 0,
+                                 f"time_lb_{i}_{j}")
+            latest = self.tm if j == depot else self.tm - self.st[j] - travel[j, depot]
+            model.addLConstr(gp.LinExpr([1.0, -latest], [w[i, j], x[i, j]]), GRB.LESS_EQUAL, 0, f"time_ub_{i}_{j}")
+        logging.info("constr 'add_two_index_constraints_batched' has been finished")
+
     def _set_objective(self):
         """目标函数：总行驶成本"""
+        if self.build_mode == "batched":
+            cost = self.input_data.distance_matrix
+            self.model.setObjective(self.x.prod({key: cost[key[0], key[1]] for key in self.x.keys() if key[0] != key[1]}),
+                                    GRB.MINIMIZE)
+            return
+        if self.formulation == "two_index":
+            self.model.setObjective(
+                gp.quicksum(self.input_data.distance_matrix[(i, j)] * self.x[i, j] for (i, j) in self.A), GRB.MINIMIZE
+            )
+            return
         obj = gp.quicksum(
             self.input_data.distance_matrix[(i, j)] * self.x[i, j, k]
             for k in self.K
-            for i in self.V
-            for j in self.V
-            if i != j
+            for (i, j) in self.A
         )
         self.model.setObjective(obj, GRB.MINIMIZE)
 
@@ -218,9 +455,12 @@ class OriginModel:
         self.model.optimize()
 
         if self.model.status == GRB.OPTIMAL:
-            self.model.write("model.lp")
+            if constant.ORIGIN_MODEL_EXPORT:
+                self.model.write("model.lp")
             return self._extract_solution()
         elif self.model.status == GRB.INFEASIBLE:
+            if not constant.ORIGIN_MODEL_EXPORT:
+                raise Exception("模型不可行（设置 constant.ORIGIN_MODEL_EXPORT = True 可导出不可约不可行子系统 model.ilp）")
             self.model.computeIIS()  # 计算不可行约束
             self.model.write("model.ilp")  # 导出不可行约束子集
             raise Exception("模型不可行，请检查 model.ilp 文件")
@@ -232,15 +472,16 @@ class OriginModel:
             'routes': {},
             'loads': {}
         }
+        if self.formulation == "two_index":
+            return self._extract_two_index_solution(solution)
 
         for k in self.K:
             # 路径提取
             path = [self.depot_id]
             current = self.depot_id
             while True:
-                next_nodes = [j for j in self.V
-                              if j != current
-                              and self.x[current, j, k].X > 0.5]
+                next_nodes = [j for j in self.out_nodes[current]
+                              if self.x[current, j, k].X > 0.5]
                 if not next_nodes:
                     break
                 next_node = next_nodes[0]
@@ -257,4 +498,19 @@ class OriginModel:
             solution['routes'][k] = path
             solution['loads'][k] = load_profile
 
-        return solution
\ No newline at end of file
+        return solution
+
+    def _extract_two_index_solution(self, solution):
+        """两下标模型：从车场出发的每条弧开始沿 x 回溯一条路径，按出发顺序编号；载货量为离开各节点时的 y + z"""
+        first_nodes = [j for j in self.out_nodes[self.depot_id] if self.x[self.depot_id, j].X > 0.5]
+        for k, first in enumerate(first_nodes):
+            path = [self.depot_id, first]
+            load_profile = {self.depot_id: self.z[self.depot_id, first].X}
+            while path[-1] != self.depot_id:
+                current = path[-1]
+                next_node = next(j for j in self.out_nodes[current] if self.x[current, j].X > 0.5)
+                load_profile[current] = self.y[current, next_node].X + self.z[current, next_node].X
+                path.append(next_node)
+            solution['routes'][k] = path
+            solution['loads'][k] = load_profile
+        return solution
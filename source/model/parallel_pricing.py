@@ -0,0 +1,85 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from ..info.input_data import InputData
+from ..model.sub_model import PricingSubproblem
+from ..utils import constant
+
+
+class ParallelPricing:
+    """
+    并行精确定价：按从车场出发后的第一个客户把搜索空间分成若干分区，各分区在进程池中独立运行标签算法后合并负缩减成本列。
+    分区之间互不支配，因此合并结果包含串行标签算法的最小缩减成本列（列数可能更多）。
+    实例数据在进程启动时以列表形式传一次，之后每次定价只传对偶值与分区。
+    """
+
+    def __init__(self, input_data: InputData, workers: int = None, partitions: int = None):
+        """
+        :param input_data: InputData 实例
+        :param workers: 进程数，默认取 constant.PRICING_WORKERS
+        :param partitions: 分区数，默认为进程数的4倍（分区越多负载越均衡，但分区间的支配越少）
+        """
+        self.workers = workers or constant.PRICING_WORKERS
+        if not self.workers or self.workers < 2:
+            raise ValueError("并行定价至少需要2个进程")
+        self.customers = [i for i in input_data.customer_dict if i != 0]
+        num_partitions = min(partitions or 4 * self.workers, len(self.customers))
+        # 按编号轮流分配客户，避免相邻编号（通常位置相近）的客户集中在同一分区
+        self.partitions = [self.customers[k::num_partitions] for k in range(num_partitions)]
+        self.instance = PricingSubproblem.compact_instance(input_data)
+        self.label_stats = {"created": 0, "dominated": 0, "removed": 0, "extended": 0}
+        self.last_label_stats = dict.fromkeys(self.label_stats, 0)  # 最近一次定价的标签计数
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            context = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_init_worker,
+                                             initargs=(self.instance, constant.VEHICLE_SPEED, constant.MAX_TRAVEL_TIME))
+        return self._pool
+
+    def solve(self, dual_values, ng_masks=None, forbidden_arcs=None):
+        """
+        :param dual_values: 主问题对偶值 {'pi': {客户: 对偶值}, 'theta': 车辆约束对偶值}
+        :param ng_masks: ng-route 邻域位掩码，None 为初等路径
+        :param forbidden_arcs: 禁止使用的弧
+        :return: 负缩减成本路径列表（按缩减成本升序）
+        """
+        pi = [0] + [dual_values['pi'][i] for i in range(1, len(self.instance["delivery"]))]
+        pool = self._get_pool()
+        futures = [pool.submit(_price_partition, pi, dual_values['theta'], partition, ng_masks, forbidden_arcs)
+                   for partition in self.partitions]
+        routes = []
+        self.last_label_stats = dict.fromkeys(self.label_stats, 0)
+        for future in futures:
+            partition_routes, label_stats = future.result()
+            routes.extend(partition_routes)
+            for key, value in label_stats.items():
+                self.label_stats[key] += value
+                self.last_label_stats[key] += value
+        routes.sort(key=lambda route: (route["reduced_cost"], route["path"]))
+        logging.info(f"并行定价: {len(self.partitions)} 个分区, {self.workers} 个进程, 负缩减成本列 {len(routes)}")
+        return routes
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+# 子进程中的实例数据（进程启动时传入一次）
+_worker_instance = None
+
+
+def _init_worker(instance, vehicle_speed, max_travel_time):
+    global _worker_instance
+    _worker_instance = instance
+    constant.VEHICLE_SPEED = vehicle_speed
+    constant.MAX_TRAVEL_TIME = max_travel_time
+
+
+def _price_partition(pi, theta, first_customers, ng_masks, forbidden_arcs):
+    psp = PricingSubproblem(dual_values={'pi': pi, 'theta': theta}, input_data=None, engine="bitset",
+                            bidirectional=False, ng_masks=ng_masks, forbidden_arcs=forbidden_arcs,
+                            first_customers=first_customers, instance=_worker_instance)
+    return psp.solve(), psp.label_stats
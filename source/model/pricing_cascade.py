@@ -0,0 +1,186 @@
+import logging
+import time
+from ..info.input_data import InputData
+from ..model.parallel_pricing import ParallelPricing
+from ..model.sub_model import PricingSubproblem
+from ..utils import constant, timing
+
+
+class PricingCascade:
+    """
+    定价级联：按开销从小到大依次尝试启发式定价，某一层找到负缩减成本列即返回；
+    所有启发式层都找不到时才运行精确标签算法，因此列生成的终止条件仍由精确定价保证。
+    limited_labeling 层限制每个节点的标签数，只有 bitset 引擎支持，因此该层总是使用 bitset 引擎（与 constant.LABEL_ENGINE 无关）。
+    """
+    LEVELS = ("local_search", "greedy_insertion", "limited_labeling", "exact")
+
+    def __init__(self, input_data: InputData, levels=None, max_labels_per_node=None, ng_neighbourhood=None):
+        """
+        :param input_data: InputData 实例
+        :param levels: 启用的层级（按此顺序尝试），默认取 constant.PRICING_CASCADE_LEVELS；"exact" 总是作为最后一层
+        :param max_labels_per_node: limited_labeling 层每个节点扩展的标签数，默认取 constant.PRICING_HEURISTIC_MAX_LABELS
+        :param ng_neighbourhood: NgNeighbourhood 实例，标签算法层使用其当前邻域做 ng-route 松弛；None 为初等路径
+        """
+        self.input_data = input_data
+        levels = list(constant.PRICING_CASCADE_LEVELS if levels is None else levels)
+        for level in levels:
+            if level not in self.LEVELS:
+                raise ValueError(f"未知的定价层级: {level}")
+        self.levels = [level for level in levels if level != "exact"] + ["exact"]
+        self.max_labels_per_node = max_labels_per_node or constant.PRICING_HEURISTIC_MAX_LABELS
+        self.ng_neighbourhood = ng_neighbourhood
+        # 精确定价层的标签引擎组合在建立级联时检查，避免在列生成中途才报错
+        if constant.LABEL_ENGINE != "bitset":
+            if constant.BIDIRECTIONAL_LABELING:
+                raise ValueError("双向标签仅支持 bitset 标签引擎")
+            if ng_neighbourhood is not None:
+                raise ValueError("ng-route 松弛仅支持 bitset 标签引擎")
+        self.customers = [i for i in input_data.customer_dict if i != 0]
+        # 每层的调用次数、找到负缩减成本列的次数、累计耗时
+        self.level_stats = {level: {"calls": 0, "success": 0, "time": 0.0} for level in self.levels}
+        self.psp = None
+        # 精确定价层的并行定价（constant.PRICING_WORKERS 为 None 时串行）
+        self.parallel_pricing = ParallelPricing(input_data=input_data) if constant.PRICING_WORKERS else None
+        self.forbidden_arcs = set()  # 分支定价中当前节点禁止的弧，各层定价都不使用这些弧
+        self.min_reduced_cost = None  # 最近一次精确定价找到的最小缩减成本（无负缩减成本列时为0），用于拉格朗日下界
+        self.label_stats = {"created": 0, "dominated": 0, "removed": 0, "extended": 0}  # 最近一次 solve 中各标签算法层的标签计数之和
+
+    @timing.profiled("定价")
+    def solve(self, dual_values, base_routes, is_existing=None, exact_only=False):
+        """
+        :param dual_values: 主问题对偶值
+        :param base_routes: 局部搜索的起点（通常为当前主问题解中取正值的列）
+        :param is_existing: 判断路径是否已在列池中的函数；某层只找到已有的列时继续尝试下一层
+        :param exact_only: 跳过启发式层直接运行精确标签算法（用于每次迭代都计算拉格朗日下界）
+        :return: (负缩减成本路径列表, 找到这些路径的层级)
+        """
+        ng_masks = self.ng_neighbourhood.masks if self.ng_neighbourhood is not None else None
+        self.psp = PricingSubproblem(dual_values=dual_values, input_data=self.input_data, ng_masks=ng_masks,
+                                     forbidden_arcs=self.forbidden_arcs)
+        feasible_routes = []
+        self.min_reduced_cost = None
+        self.label_stats = dict.fromkeys(self.label_stats, 0)
+        for level in (["exact"] if exact_only else self.levels):
+            st = time.perf_counter()
+            # 各层级为"定价"下的子代码段，标签算法层中再分为标签扩展、支配检查、缩减成本（并行定价在子进程中，不再细分）
+            with timing.section(level):
+                if level == "local_search":
+                    feasible_routes = self._local_search(base_routes)
+                elif level == "greedy_insertion":
+                    feasible_routes = self._greedy_insertion()
+                elif level == "limited_labeling":
+                    limited_psp = PricingSubproblem(dual_values=dual_values, input_data=self.input_data,
+                                                    engine="bitset", max_labels_per_node=self.max_labels_per_node,
+                                                    ng_masks=ng_masks, forbidden_arcs=self.forbidden_arcs)
+                    feasible_routes = limited_psp.solve()
+                    self._add_label_stats(limited_psp.label_stats)
+                elif self.parallel_pricing is not None:
+                    feasible_routes = self.parallel_pricing.solve(dual_values=dual_values, ng_masks=ng_masks,
+                                                                  forbidden_arcs=self.forbidden_arcs)
+                    self._add_label_stats(self.parallel_pricing.last_label_stats)
+                    # 合并结果包含串行标签算法的最小缩减成本列，同样可用于拉格朗日下界
+                    self.min_reduced_cost = min((route["reduced_cost"] for route in feasible_routes), default=0.0)
+                else:
+                    feasible_routes = self.psp.solve()
+                    self._add_label_stats(self.psp.label_stats)
+                    self.min_reduced_cost = min((route["reduced_cost"] for route in feasible_routes), default=0.0)
+            if is_existing is not None:
+                # 上界为1的列在最优解中缩减成本可能为负，会被重复找到
+                feasible_routes = [route for route in feasible_routes if not is_existing(route["path"])]
+            stats = self.level_stats[level]
+            stats["calls"] += 1
+            elapsed = time.perf_counter() - st
+            stats["time"] += elapsed
+            logging.info(f"定价层级 {level}: 负缩减成本列 {len(feasible_routes)}, 耗时 {elapsed:.4f}")
+            if feasible_routes:
+                stats["success"] += 1
+                return feasible_routes, level
+        return feasible_routes, "exact"
+
+    def shutdown(self):
+        """关闭并行定价的进程池"""
+        if self.parallel_pricing is not None:
+            self.parallel_pricing.shutdown()
+
+    def _add_label_stats(self, label_stats):
+        for key, value in label_stats.items():
+            self.label_stats[key] += value
+
+    def log_level_stats(self):
+        for level, stats in self.level_stats.items():
+            logging.info(f"定价层级 {level}: 调用 {stats['calls']} 次, 找到新列 {stats['success']} 次, "
+                         f"累计耗时 {stats['time']:.4f}")
+
+    def _make_route(self, path):
+        """按 extend_label 的规则检查路径，可行且缩减成本为负时返回路径字典"""
+        label = self.psp.evaluate_path(path)
+        if not label:
+            return None
+        reduced_cost = self.psp.calculate_reduced_cost(label)
+        if reduced_cost >= -1e-6:
+            return None
+        return {"path": label["path"], "cost": label["cost"], "reduced_cost": reduced_cost}
+
+    def _collect(self, paths):
+        """评估候选路径并去重，按缩减成本升序返回"""
+        routes = {}
+        for path in paths:
+            key = tuple(path)
+            if key in routes:
+                continue
+            route = self._make_route(path)
+            if route:
+                routes[key] = route
+        return sorted(routes.values(), key=lambda route: route["reduced_cost"])
+
+    def _local_search(self, base_routes):
+        """对已有列做删除、插入、替换一个客户的邻域搜索"""
+        pi = self.psp.dual_values['pi']
+        candidates = []
+        for route in base_routes:
+            customers = route["path"][1:-1]
+            outside = [k for k in self.customers if k not in customers and pi[k] > 0]
+            for pos in range(len(customers)):
+                # 删除一个客户
+                if len(customers) > 1:
+                    candidates.append([0] + customers[:pos] + customers[pos + 1:] + [0])
+                # 用未访问的客户替换
+                for k in outside:
+                    candidates.append([0] + customers[:pos] + [k] + customers[pos + 1:] + [0])
+            # 插入一个未访问的客户
+            for k in outside:
+                for pos in range(len(customers) + 1):
+                    candidates.append([0] + customers[:pos] + [k] + customers[pos:] + [0])
+        return self._collect(candidates)
+
+    def _greedy_insertion(self):
+        """以每个对偶值为正的客户为种子，反复插入使缩减成本下降最多的客户，直到不能再改进"""
+        pi = self.psp.dual_values['pi']
+        dist = self.input_data.distance_matrix.rows
+        seeds = sorted((k for k in self.customers if pi[k] > 0), key=lambda k: pi[k], reverse=True)
+        candidates = []
+        for seed in seeds:
+            path = [0, seed, 0]
+            if not self.psp.evaluate_path(path):
+                continue
+            while True:
+                # 按缩减成本增量排序候选插入，取第一个满足 extend_label 规则的插入
+                moves = []
+                for k in self.customers:
+                    if k in path or pi[k] <= 0:
+                        continue
+                    for pos in range(1, len(path)):
+                        a, b = path[pos - 1], path[pos]
+                        delta = dist[a][k] + dist[k][b] - dist[a][b] - pi[k]
+                        if delta < -1e-6:
+                            moves.append((delta, pos, k))
+                moves.sort()
+                for _, pos, k in moves:
+                    new_path = path[:pos] + [k] + path[pos:]
+                    if self.psp.evaluate_path(new_path):
+                        path = new_path
+                        break
+                else:
+                    break
+            candidates.append(path)
+        return self._collect(candidates)
@@ -1,51 +1,131 @@
 import logging
 import heapq
+import itertools
+import time
 from collections import defaultdict
-from ..utils import constant
+from ..model.dominance import DominanceIndex
+from ..model.label import Label
+from ..utils import constant, timing
 
 
 class PricingSubproblem:
-    def __init__(self, dual_values, input_data):
+    def __init__(self, dual_values, input_data, engine=None, bidirectional=None, max_labels_per_node=None,
+                 ng_masks=None, forbidden_arcs=None, first_customers=None, instance=None):
+        """
+        :param dual_values: 主问题对偶值 {'pi': {客户: 对偶值}, 'theta': 车辆约束对偶值}
+        :param input_data: InputData 实例
+        :param engine: 标签引擎，"dict"（字典标签）或 "bitset"（紧凑标签），默认取 constant.LABEL_ENGINE
+        :param bidirectional: 是否使用双向标签（仅 bitset 引擎），默认取 constant.BIDIRECTIONAL_LABELING
+        :param max_labels_per_node: 每个节点最多扩展的标签数（仅 bitset 引擎），None 为不限制（精确定价）；
+                                    限制后为启发式定价，找不到负缩减成本列并不代表不存在
+        :param ng_masks: ng-route 松弛的邻域位掩码（第i项为节点i的邻域，含i自身），见 NgNeighbourhood.masks；
+                         None 为初等路径（仅 bitset 引擎、单向标签支持 ng-route）
+        :param forbidden_arcs: 禁止使用的弧 {(i, j)}（分支定价中由分支决策得到），None 为不禁止
+        :param first_customers: 只搜索从车场出发后第一个客户在其中的路径（并行定价的分区，仅 bitset 引擎单向标签），
+                                None 为不限制
+        :param instance: 紧凑实例数据（见 compact_instance），给定时 input_data 可为 None（仅 bitset 引擎）
+        """
         self.input_data = input_data
         self.dual_values = dual_values
+        self.engine = engine or constant.LABEL_ENGINE
+        if self.engine not in ("dict", "bitset"):
+            raise ValueError(f"未知的标签引擎: {self.engine}")
+        self.bidirectional = constant.BIDIRECTIONAL_LABELING if bidirectional is None else bidirectional
+        if self.bidirectional and self.engine != "bitset":
+            raise ValueError("双向标签仅支持 bitset 标签引擎")
+        self.max_labels_per_node = max_labels_per_node
+        if self.max_labels_per_node is not None and self.engine != "bitset":
+            raise ValueError("限制每个节点的标签数仅支持 bitset 标签引擎")
+        self.ng_masks = ng_masks
+        if self.ng_masks is not None and (self.engine != "bitset" or self.bidirectional):
+            raise ValueError("ng-route 松弛仅支持 bitset 标签引擎的单向标签")
+        self.forbidden_arcs = forbidden_arcs or set()
+        self.first_customers = first_customers
+        if self.first_customers is not None and (self.engine != "bitset" or self.bidirectional):
+            raise ValueError("按第一个客户分区仅支持 bitset 标签引擎的单向标签")
+        self.instance = instance
+        if self.instance is not None and self.engine != "bitset":
+            raise ValueError("紧凑实例数据仅支持 bitset 标签引擎")
         self.feasible_routes = []
-        self.num_customers = len(input_data.customer_dict) - 1
-        self.Q = input_data.vehicle_info.capacity  # 车辆容量
+        # 标签计数：生成数、到达即被支配数、入队后被新标签淘汰数、实际扩展数
+        self.label_stats = {"created": 0, "dominated": 0, "removed": 0, "extended": 0}
+        if instance is not None:
+            self.num_customers = len(instance["delivery"]) - 1
+            self.Q = instance["capacity"]
+        else:
+            self.num_customers = len(input_data.customer_dict) - 1
+            self.Q = input_data.vehicle_info.capacity  # 车辆容量
         # +++ 新增时间参数 +++
         self.v = constant.VEHICLE_SPEED  # 从配置获取速度
         self.tm = constant.MAX_TRAVEL_TIME  # 最大在途时间
-        self.st = {i: input_data.customer_dict[i].service_time for i in input_data.customer_dict}  # 服务时间
+        if instance is not None:
+            self.st = dict(enumerate(instance["service"]))
+        else:
+            self.st = {i: input_data.customer_dict[i].service_time for i in input_data.customer_dict}  # 服务时间
+        # 弧预处理得到的可行后继/前驱列表；预处理所用的最大在途时间小于当前值时不能使用，退回遍历所有节点
+        if instance is not None:
+            arc_time_limit, self.successors, self.predecessors = \
+                instance["arc_time_limit"], instance["successors"], instance["predecessors"]
+        else:
+            arc_time_limit, self.successors, self.predecessors = \
+                input_data.arc_time_limit, input_data.successors, input_data.predecessors
+        if arc_time_limit < self.tm:
+            all_nodes = list(range(self.num_customers + 1))
+            self.successors = self.predecessors = [all_nodes] * (self.num_customers + 1)
 
 
     def solve(self):
-        heap = []
-        # 初始标签：从车场出发，载货量为0，但尚未确定实际需要的初始载货量
-        initial_label = {
+        if self.engine == "bitset":
+            routes = self._solve_bitset()
+        else:
+            routes = self._solve_dict()
+        self._log_label_stats()
+        return routes
+
+    def _log_label_stats(self):
+        stats = self.label_stats
+        pruned = stats["dominated"] + stats["removed"]
+        pruning_rate = pruned / stats["created"] if stats["created"] else 0
+        logging.info(f"标签统计: 生成 {stats['created']}, 到达即被支配 {stats['dominated']}, "
+                     f"入队后被淘汰 {stats['removed']}, 扩展 {stats['extended']}, 剪枝率 {pruning_rate:.1%}")
+
+    @staticmethod
+    def _initial_dict_label():
+        # 初始标签：从车场出发，尚未装载任何配送货物
+        return {
             "node": 0,
             "path": [0],
             "visited": set(),
-            "initial_load": 0,
+            "max_load": 0,
             "remaining_load": 0,
             "total_delivery": 0,
             "total_pickup": 0,
             "total_time": 0,  # 新增总时间（行驶+服务）
-            "cost": 0
+            "cost": 0,
+            "reduced_cost": 0  # 累计缩减成本：sum(弧成本) - sum(pi_j)，theta 在回到车场时计入
         }
-        heapq.heappush(heap, (initial_label["cost"], id(initial_label), initial_label))
+
+    def _solve_dict(self):
+        heap = []
+        counter = itertools.count()  # 同成本标签按生成顺序出堆，保证结果可复现
+        initial_label = self._initial_dict_label()
+        heapq.heappush(heap, (initial_label["reduced_cost"], next(counter), initial_label))
         dominance_dict = defaultdict(list)
 
         while heap:
-            current_cost, _, current_label = heapq.heappop(heap)
+            _, _, current_label = heapq.heappop(heap)
             current_node = current_label["node"]
 
             # 剪枝：若标签被支配，跳过
             if self.is_dominated(current_label, dominance_dict[current_node]):
+                self.label_stats["dominated"] += 1
                 continue
 
             dominance_dict[current_node].append(current_label)
+            self.label_stats["extended"] += 1
 
-            # 遍历所有可能的下一节点
-            for next_node in range(self.num_customers + 1):
+            # 遍历弧预处理后的可行后继
+            for next_node in self.successors[current_node]:
                 if next_node == current_node or next_node in current_label["visited"]:
                     continue
 
@@ -53,27 +133,271 @@ class PricingSubproblem:
                 if not new_label:
                     continue  # 路径不可行
 
-                # 若回到车场，检查初始载货量是否满足总配送需求
+                # 回到车场：载货量已在扩展时检查，记录负缩减成本路径
                 if next_node == 0:
-                    if new_label["initial_load"] >= new_label["total_delivery"]:
-                        reduced_cost = self.calculate_reduced_cost(new_label)
-                        if reduced_cost < -1e-6:
-                            self.feasible_routes.append({
-                                "path": new_label["path"],
-                                "cost": new_label["cost"],
-                                "reduced_cost": reduced_cost
-                            })
+                    reduced_cost = self.calculate_reduced_cost(new_label)
+                    if reduced_cost < -1e-6:
+                        self.feasible_routes.append({
+                            "path": new_label["path"],
+                            "cost": new_label["cost"],
+                            "reduced_cost": reduced_cost
+                        })
                     continue
 
                 # 应用支配规则并加入队列
+                self.label_stats["created"] += 1
                 if not self.is_dominated(new_label, dominance_dict[next_node]):
 
-                    heapq.heappush(heap, (new_label["cost"], id(new_label), new_label))
+                    heapq.heappush(heap, (new_label["reduced_cost"], next(counter), new_label))
+                else:
+                    self.label_stats["dominated"] += 1
 
         return self.feasible_routes
 
+    def _solve_bitset(self):
+        """
+        与 _solve_dict 逻辑一致，但标签为 __slots__ 对象、visited 为位掩码、路径用父指针回溯。
+        标签按累计缩减成本出堆；支配检查使用按节点分桶的 DominanceIndex：索引保存已入队的标签，新标签入队时淘汰被它支配的标签。
+        """
+        self._init_arrays()
+        if self.bidirectional:
+            return self._solve_bidirectional()
+        self._labeling(forward=True, keep_limit=self.tm, extend_limit=self.tm, collect_routes=True)
+        return self.feasible_routes
+
+    @staticmethod
+    def compact_instance(input_data):
+        """
+        标签算法用到的实例数据展开为列表（下标为节点编号，车场为0），体积小、可直接传给子进程
+        :return: {"dist": 距离矩阵, "travel": 行驶时间矩阵, "delivery": 配送量, "pickup": 取货量,
+                  "service": 服务时间（车场为0，与 extend_label 一致，回到车场时不计入车场服务时间）,
+                  "capacity": 车辆容量, "successors"/"predecessors": 可行后继/前驱列表, "arc_time_limit": 弧预处理所用的最大在途时间}；
+                  矩阵与后继/前驱列表直接引用 InputData 中的嵌套列表，不要修改
+        """
+        service = input_data.service_time.tolist()
+        service[0] = 0
+        return {
+            "dist": input_data.distance_matrix.rows,
+            "travel": input_data.travel_time_matrix.rows,
+            "delivery": input_data.delivery_qty.tolist(),
+            "pickup": input_data.pick_up_qty.tolist(),
+            "service": service,
+            "capacity": input_data.vehicle_info.capacity,
+            "successors": input_data.successors,
+            "predecessors": input_data.predecessors,
+            "arc_time_limit": input_data.arc_time_limit
+        }
+
+    def _init_arrays(self):
+        """预先展开为列表，避免热循环中的元组哈希与对象属性查找"""
+        n = self.num_customers + 1
+        instance = self.instance or self.compact_instance(self.input_data)
+        self._dist = instance["dist"]
+        self._travel = instance["travel"]
+        if self.forbidden_arcs:
+            # 禁止的弧行驶时间为无穷大，扩展时即被时间约束剪掉（复制一份，不修改共享的矩阵）
+            self._travel = [list(row) for row in self._travel]
+            for i, j in self.forbidden_arcs:
+                self._travel[i][j] = float("inf")
+        self._delivery, self._pickup, self._service = instance["delivery"], instance["pickup"], instance["service"]
+        self._pi = [0] + [self.dual_values['pi'][i] for i in range(1, n)]
+
+    @staticmethod
+    def _root_label():
+        """车场出发（或反向时到达车场）的初始标签"""
+        return Label(node=0, parent=None, visited=0, n_visited=0, max_load=0, remaining_load=0,
+                     total_delivery=0, total_pickup=0, total_time=0, cost=0, reduced_cost=0)
+
+    def _labeling(self, forward, keep_limit, extend_limit, collect_routes):
+        """
+        单向标签算法，返回各节点的支配索引（其中为未被支配的标签）
+        :param forward: True 为从车场正向扩展；False 为从车场反向扩展，标签记录从该节点到回到车场的后半段路径。
+                        反向扩展相当于在倒过来的路径上正向扩展，此时取货与配送互换（倒过来看，车辆出发时装载的是取货量），
+                        载货量规则与正向相同；反向标签的 total_delivery / total_pickup 分别为后半段的取货量 / 配送量
+        :param keep_limit: 新标签的累计时间超过该值时丢弃
+        :param extend_limit: 仅扩展累计时间不超过该值的标签
+        :param collect_routes: 正向扩展回到车场时是否记录负缩减成本路径
+        """
+        n = self.num_customers + 1
+        if forward:
+            dist, travel = self._dist, self._travel
+            neighbours = self.successors
+            delivery, pickup = self._delivery, self._pickup
+        else:
+            # 反向扩展时从当前节点 j 走向前驱 i，所用弧为 (i, j)
+            dist = [list(col) for col in zip(*self._dist)]
+            travel = [list(col) for col in zip(*self._travel)]
+            neighbours = self.predecessors
+            delivery, pickup = self._pickup, self._delivery
+        service, pi = self._service, self._pi
+        theta = self.dual_values['theta']
+        capacity = self.Q
+        ng_masks = self.ng_masks
+        first_nodes = neighbours[0] if self.first_customers is None else \
+            [i for i in neighbours[0] if i in self.first_customers]
+
+        heap = []
+        counter = itertools.count()
+        initial_label = self._root_label()
+        heapq.heappush(heap, (initial_label.reduced_cost, next(counter), initial_label))
+        dominance_index = defaultdict(DominanceIndex)
+        stats = self.label_stats
+        max_labels = self.max_labels_per_node
+        extended_count = [0] * n
+        # 耗时分析：只对支配检查与回到车场时的缩减成本计时，其余（出堆、资源递推、生成标签）记为标签扩展
+        clock = time.perf_counter if timing.is_enabled() else None
+        dominance_time = reduced_cost_time = 0.0
+        loop_start = clock() if clock is not None else 0.0
+
+        while heap:
+            _, _, current_label = heapq.heappop(heap)
+            if current_label.dominated or current_label.total_time > extend_limit:
+                continue
+            current_node = current_label.node
+            if max_labels is not None:
+                # 标签按缩减成本出堆，只扩展每个节点上缩减成本最小的 max_labels 个标签
+                if extended_count[current_node] >= max_labels:
+                    continue
+                extended_count[current_node] += 1
+            stats["extended"] += 1
+
+            visited = current_label.visited
+            dist_row, travel_row = dist[current_node], travel[current_node]
+            # 并行定价的分区：车场出发的初始标签只扩展到本分区的第一个客户
+            successors = first_nodes if current_node == 0 else neighbours[current_node]
+            for next_node in successors:
+                if next_node == current_node or visited >> next_node & 1:
+                    continue
+                if next_node == 0 and not collect_routes:
+                    continue
+
+                # 与 extend_label 相同的资源递推（保持浮点运算顺序一致）
+                new_total_delivery = current_label.total_delivery + delivery[next_node]
+                new_total_pickup = current_label.total_pickup + pickup[next_node]
+                new_total_time = current_label.total_time + travel_row[next_node] + service[next_node]
+                if new_total_time > keep_limit:
+                    continue
+                new_max_load = max(current_label.max_load + delivery[next_node], new_total_pickup)
+                if new_max_load > capacity:
+                    continue
+                new_cost = current_label.cost + dist_row[next_node]
+                new_reduced_cost = current_label.reduced_cost + dist_row[next_node] - pi[next_node]
+
+                if next_node == 0:
+                    if clock is not None:
+                        st = clock()
+                    reduced_cost = new_reduced_cost - theta
+                    if reduced_cost < -1e-6:
+                        self.feasible_routes.append({
+                            "path": current_label.path() + [0],
+                            "cost": new_cost,
+                            "reduced_cost": reduced_cost
+                        })
+                    if clock is not None:
+                        reduced_cost_time += clock() - st
+                    continue
+
+                if ng_masks is None:
+                    new_visited, new_n_visited = visited | 1 << next_node, current_label.n_visited + 1
+                else:
+                    # ng-route：只记住 next_node 邻域内已访问的客户，邻域外的客户允许再次访问
+                    new_visited = visited & ng_masks[next_node] | 1 << next_node
+                    new_n_visited = new_visited.bit_count()
+                new_label = Label(node=next_node, parent=current_label, visited=new_visited,
+                                  n_visited=new_n_visited, max_load=new_max_load,
+                                  remaining_load=new_total_pickup, total_delivery=new_total_delivery,
+                                  total_pickup=new_total_pickup, total_time=new_total_time, cost=new_cost,
+                                  reduced_cost=new_reduced_cost)
+                stats["created"] += 1
+                if clock is not None:
+                    st = clock()
+                node_index = dominance_index[next_node]
+                dominated = node_index.is_dominated(new_label)
+                if not dominated:
+                    stats["removed"] += node_index.remove_dominated_by(new_label)
+                    node_index.add(new_label)
+                if clock is not None:
+                    dominance_time += clock() - st
+                if dominated:
+                    stats["dominated"] += 1
+                    continue
+                heapq.heappush(heap, (new_reduced_cost, next(counter), new_label))
+
+        if clock is not None:
+            timing.add_time("标签扩展", clock() - loop_start - dominance_time - reduced_cost_time)
+            timing.add_time("支配检查", dominance_time)
+            timing.add_time("缩减成本", reduced_cost_time)
+        return dominance_index
+
+    def _solve_bidirectional(self):
+        """
+        双向标签：正向标签只保留累计时间不超过 tm/2 的部分，反向标签只扩展累计时间不超过 tm/2 的标签，
+        再沿弧 (i, j) 拼接正向标签（终点 i）与反向标签（起点 j）。拼接点取路径上正向累计时间不超过 tm/2 的最后一个节点，
+        其前后两段都会被生成；若某段被支配，支配它的标签沿同一路径后移拼接点后可拼出缩减成本不更大的可行路径，
+        因此最小缩减成本与正向标签一致，是否存在负缩减成本列的判断也一致。
+        """
+        half_time = self.tm / 2
+        forward_index = self._labeling(forward=True, keep_limit=half_time, extend_limit=half_time,
+                                       collect_routes=False)
+        backward_index = self._labeling(forward=False, keep_limit=self.tm, extend_limit=half_time,
+                                        collect_routes=False)
+
+        forward_labels = [self._root_label()]
+        for node_index in forward_index.values():
+            forward_labels.extend(node_index)
+        # 反向标签按节点分组并按缩减成本升序，拼接时一旦缩减成本不再为负即可停止
+        backward_labels = {0: [self._root_label()]}
+        for node, node_index in backward_index.items():
+            backward_labels[node] = sorted(node_index, key=lambda label: label.reduced_cost)
+
+        dist, travel, theta = self._dist, self._travel, self.dual_values['theta']
+        seen_paths = set()
+        join_start = time.perf_counter()
+        for forward_label in forward_labels:
+            i = forward_label.node
+            for j, labels in backward_labels.items():
+                if j == i:
+                    continue
+                head_reduced_cost = forward_label.reduced_cost + dist[i][j] - theta
+                head_time = forward_label.total_time + travel[i][j]
+                # 只在"正向标签无法在 tm/2 内再扩展到 j"处拼接，每条路径只有唯一拼接点
+                if j != 0 and head_time + self._service[j] <= half_time:
+                    continue
+                for backward_label in labels:
+                    reduced_cost = head_reduced_cost + backward_label.reduced_cost
+                    if reduced_cost >= -1e-6:
+                        break
+                    if forward_label.visited & backward_label.visited:
+                        continue
+                    if not self._is_join_feasible(forward_label, backward_label, head_time):
+                        continue
+                    path = forward_label.path() + backward_label.path()[::-1]
+                    path_key = tuple(path)
+                    if path_key in seen_paths:
+                        continue
+                    seen_paths.add(path_key)
+                    self.feasible_routes.append({
+                        "path": path,
+                        "cost": forward_label.cost + dist[i][j] + backward_label.cost,
+                        "reduced_cost": reduced_cost
+                    })
+        timing.add_time("双向拼接", time.perf_counter() - join_start)
+        return self.feasible_routes
+
+    def _is_join_feasible(self, forward_label, backward_label, head_time):
+        """
+        按 extend_label 的时间与载货规则检查正反向标签拼接后的整条路径：前半段每段弧上还要装载后半段的配送量
+        （反向标签的 total_pickup），后半段每段弧上还有前半段的取货量，拼接弧上的载货量不超过两者
+        """
+        if head_time + backward_label.total_time > self.tm:
+            return False
+        return (forward_label.max_load + backward_label.total_pickup <= self.Q
+                and backward_label.max_load + forward_label.total_pickup <= self.Q)
+
     def extend_label(self, label, next_node):
         """扩展标签到下一节点，返回新标签或None（若不可行）"""
+        if (label["node"], next_node) in self.forbidden_arcs:
+            return None
         # 获取客户需求（车场无需求）
         if next_node == 0:
             delivery, pickup = 0, 0
@@ -86,7 +410,8 @@ class PricingSubproblem:
         new_total_pickup = label["total_pickup"] + pickup
 
         # 计算行驶时间（距离/速度）
-        travel_time = self.input_data.distance_matrix[(label["node"], next_node)] / self.v
+        distance = self.input_data.distance_matrix.rows[label["node"]][next_node]
+        travel_time = distance / self.v
         # 服务时间（仅客户节点）
         service_time = self.st[next_node] if next_node != 0 else 0
         new_total_time = label["total_time"] + travel_time + service_time
@@ -95,52 +420,68 @@ class PricingSubproblem:
         if new_total_time > self.tm:
             return None  # 超过最大时间限制
 
-        # 关键修正：更新初始载货量（出发时必须携带足够的总配送需求）
-        # 初始载货量 = max(当前初始载货量, 新的总配送需求)
-        new_initial_load = max(label["initial_load"], new_total_delivery)
+        # 载货量：车辆从车场出发时装载路径上全部客户的配送量，离开路径上第 k 个节点时的载货量为
+        # 总配送量 - 前 k 个节点的配送量 + 前 k 个节点的取货量。新客户的配送量 delivery 在此前每段弧上都要装载，
+        # 因此 途中最大载货量 = max(原最大载货量 + delivery, 离开新节点时的载货量（即已取货总量）)
+        new_max_load = max(label["max_load"] + delivery, new_total_pickup)
 
-        # 检查车辆容量是否足够（初始载货量 + 取货量 - 配送量 ≤ Q）
-        if new_initial_load + (new_total_pickup - new_total_delivery) > self.Q:
+        # 检查车辆容量是否足够（每段弧上的实际载货量 ≤ Q，含从车场出发的第一段）
+        if new_max_load > self.Q:
             return None
 
-        # 更新剩余载货量（初始载货量 - 已配送总量 + 已取货总量）
-        new_remaining_load = new_initial_load - new_total_delivery + new_total_pickup
-        if new_remaining_load < 0:
-            return None
+        # 离开新节点时的载货量：本路径迄今的配送货物已送完，车上只有已取的货物
+        new_remaining_load = new_total_pickup
 
         # 生成新标签
         new_label = {
             "node": next_node,
             "path": label["path"] + [next_node],
             "visited": label["visited"].copy(),
-            "initial_load": new_initial_load,
+            "max_load": new_max_load,
             "remaining_load": new_remaining_load,
             "total_delivery": new_total_delivery,
             "total_pickup": new_total_pickup,
             "total_time": new_total_time,  # 记录累计时间
-            "cost": label["cost"] + self.input_data.distance_matrix[(label["node"], next_node)]
+            "cost": label["cost"] + distance,
+            # 累计缩减成本：每条弧计入 弧成本 - pi_j（车场无对偶值）
+            "reduced_cost": label["reduced_cost"] + distance - self.dual_values['pi'].get(next_node, 0)
         }
         if next_node != 0:
             new_label["visited"].add(next_node)
 
         return new_label
 
+    def evaluate_path(self, path):
+        """按 extend_label 的规则逐点检查完整路径 [0, ..., 0]，可行时返回回到车场的标签，否则返回None"""
+        label = self._initial_dict_label()
+        for next_node in path[1:]:
+            if next_node in label["visited"]:
+                return None
+            label = self.extend_label(label, next_node)
+            if not label:
+                return None
+        if label["node"] != 0:
+            return None
+        return label
+
     def calculate_reduced_cost(self, label):
-        """计算缩减成本：cost - sum(pi_i) + theta"""
-        return label["cost"] - sum(self.dual_values['pi'][i] for i in label["visited"]) + self.dual_values['theta']
+        """计算回到车场的路径的缩减成本：cost - sum(pi_i) - theta，其中 cost - sum(pi_i) 已在标签中累计"""
+        return label["reduced_cost"] - self.dual_values['theta']
 
     @staticmethod
     def is_dominated(new_label, existing_labels):
         """检查新标签是否被支配"""
         for existing in existing_labels:
             time_condition = existing["total_time"] <= new_label["total_time"]
-            load_condition = (existing["initial_load"] <= new_label["initial_load"] and
-                              existing["remaining_load"] >= new_label["remaining_load"])
+            # 途中最大载货量与当前载货量越小，后续可配送、可取货的空间越大
+            load_condition = (existing["max_load"] <= new_label["max_load"] and
+                              existing["remaining_load"] <= new_label["remaining_load"])
             visited_condition = existing["visited"].issubset(new_label["visited"])
-            cost_condition = existing["cost"] <= new_label["cost"]
+            # 按缩减成本比较：任一可行的后续扩展对两者增加相同的缩减成本
+            cost_condition = existing["reduced_cost"] <= new_label["reduced_cost"]
 
             # +++ 时间成为支配条件之一 +++
             if (time_condition and load_condition and
                     visited_condition and cost_condition):
                 return True
-        return False
\ No newline at end of file
+        return False
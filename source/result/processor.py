@@ -1,8 +1,76 @@
+import logging
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from ..utils import timing
+
+
+@dataclass(frozen=True)
+class RouteResult:
+    """解中的一条路径"""
+    idx: int  # 在主问题中的列编号
+    path: Tuple[int, ...]
+    cost: float
+
+
+@dataclass(frozen=True)
+class IterationRecord:
+    """列生成根节点的一次主问题求解（只保存列编号，路径见 SolveResult.columns）"""
+    iteration: int
+    mp_obj: float  # 主问题目标值
+    active: Tuple[int, ...]  # 主问题解中取正值的列
+    added: Tuple[int, ...]  # 本次定价后加入主问题的列
+
+
+@dataclass(frozen=True)
+class SolveResult:
+    """
+    一次列生成求解的不可变结果：可视化、日志与导出只读取该对象，不再访问（或重新运行）ModelManager
+    """
+    routes: Tuple[RouteResult, ...]  # 整数解中的路径
+    total_cost: Optional[float]  # 整数解成本，找不到整数解时为 None
+    lp_cost: float  # 最终主问题（线性松弛）的目标值
+    lower_bound: Optional[float]  # 列生成过程中最好的拉格朗日下界
+    num_columns: int  # 生成过的列数
+    columns: Tuple[RouteResult, ...]  # 所有生成过的列，下标即列编号
+    iterations: Tuple[IterationRecord, ...]  # 根节点每次主问题求解的记录（迭代可视化）
+    bounds: Tuple[Tuple[float, Optional[float]], ...]  # 每次迭代的 (主问题目标值, 拉格朗日下界)
+    pricing_levels: Tuple[str, ...]  # 每次迭代找到新列（或确认无新列）的定价层级
+    timings: Tuple[Tuple[str, float], ...]  # (以 "/" 连接的代码段层级路径, 总耗时)，见 timing.totals
+
+    def route_dict(self):
+        """整数解路径 {"Route 列编号": {'cost', 'path'}}（与 ModelManager.imp_routes 的格式一致）"""
+        return {f"Route {route.idx}": {'cost': route.cost, 'path': list(route.path)} for route in self.routes}
+
+
 class ResultProcessor:
+    """把 ModelManager 求解后的状态整理为不可变的 SolveResult"""
 
-    def __init__(self,
-                 res):
-        self.res = res
+    def __init__(self, model_manager):
+        """
+        :param model_manager: 已调用过 run_cg_model 的 ModelManager 实例
+        """
+        self.result = self.collect(model_manager)
 
+    @staticmethod
+    def collect(model_manager) -> SolveResult:
+        routes = tuple(RouteResult(idx=int(key.split()[1]), path=tuple(route['path']), cost=route['cost'])
+                       for key, route in (model_manager.imp_routes or {}).items())
+        columns = tuple(RouteResult(idx=idx, path=tuple(route['path']), cost=route['cost'])
+                        for idx, route in enumerate(model_manager.rmp.routes))
+        iterations = tuple(IterationRecord(**record) for record in model_manager.iteration_records)
+        return SolveResult(routes=routes,
+                           total_cost=model_manager.imp_total_cost,
+                           lp_cost=model_manager.rmp.mp_obj,
+                           lower_bound=model_manager.lower_bound,
+                           num_columns=len(columns),
+                           columns=columns,
+                           iterations=iterations,
+                           bounds=tuple(model_manager.bounds),
+                           pricing_levels=tuple(model_manager.pricing_levels),
+                           timings=tuple(timing.totals()))
 
-    pass
+    def log_summary(self):
+        result = self.result
+        logging.info(f"松弛的cg模型中，总成本: {result.lp_cost}")
+        logging.info(f"完整的cg模型中，选择路径: {result.route_dict()}")
+        logging.info(f"完整的cg模型中，总成本: {result.total_cost}")
@@ -0,0 +1,87 @@
+import csv
+import json
+import logging
+import os
+import time
+from ..utils import constant, filename
+
+
+class IterationTelemetry:
+    """
+    列生成迭代遥测：根节点每次迭代写一条结构化记录到 JSONL 或 CSV 文件，每条记录写出后立即 flush，
+    长时间运行时可以实时查看（如 tail -f），结束后可直接读入分析，不必解析日志。
+    一条记录在迭代开始（主问题求解前）由 begin 建立，迭代中由 update 补充，在迭代结束（定价与加入新列之后）由 end 写出；
+    迭代提前返回或出错时 end 同样会被调用，因此最后一次迭代的记录不会丢失。
+    """
+    FIELDS = ("iteration",  # 迭代编号
+              "elapsed",  # 从列生成开始到本次迭代结束的耗时（秒）
+              "iteration_time",  # 本次迭代的耗时（秒，从主问题求解前到定价与加入新列之后）
+              "rmp_obj",  # 主问题目标值
+              "lagrangian_bound",  # 本次迭代的拉格朗日下界（未运行精确定价时为空）
+              "best_bound",  # 目前最好的拉格朗日下界
+              "pricing_level",  # 找到新列（或确认无新列）的定价层级
+              "columns_added",  # 加入主问题的新列数
+              "columns_restored",  # 从侧池恢复的列数
+              "labels_created",  # 标签算法生成的标签数
+              "labels_dominated",  # 被支配的标签数（到达即被支配 + 入队后被新标签淘汰）
+              "labels_extended",  # 实际扩展的标签数
+              "rmp_time",  # 主问题求解耗时（秒，含对偶值提取）
+              "pricing_time",  # 定价耗时（秒，含误定价后的重新定价）
+              "pool_size",  # 生成过的列数
+              "rmp_columns",  # 主问题中的列数（不含侧池）
+              "purged_columns")  # 侧池中的列数
+    FORMATS = ("jsonl", "csv")
+
+    def __init__(self, folder: str, fmt: str = None):
+        """
+        :param folder: 输出目录（通常为 Config().output_folder）
+        :param fmt: "jsonl" 或 "csv"，默认取 constant.CG_METRICS_FORMAT
+        """
+        self.fmt = fmt or constant.CG_METRICS_FORMAT
+        if self.fmt not in self.FORMATS:
+            raise ValueError(f"未知的遥测文件格式: {self.fmt}")
+        os.makedirs(folder, exist_ok=True)
+        self.path = os.path.join(folder, f"{filename.CG_METRICS_FILE}.{self.fmt}")
+        self.file = open(self.path, "w", newline="", encoding="utf-8")
+        self.writer = None
+        if self.fmt == "csv":
+            self.writer = csv.DictWriter(self.file, fieldnames=self.FIELDS)
+            self.writer.writeheader()
+            self.file.flush()
+        self.start = time.perf_counter()
+        self.pending = None  # 尚未写出的当前迭代记录
+        self.iteration_start = None  # 当前迭代开始的时间
+        self.count = 0
+
+    def begin(self, **fields):
+        """开始记录新的一次迭代（上一次迭代的记录未写出时先写出）"""
+        self.end()
+        self.pending = dict.fromkeys(self.FIELDS)
+        self.pending.update(fields)
+        self.iteration_start = time.perf_counter()
+
+    def update(self, **fields):
+        """补充当前迭代的字段"""
+        if self.pending is not None:
+            self.pending.update(fields)
+
+    def end(self):
+        """本次迭代结束：补上耗时，写出记录并 flush"""
+        if self.pending is None:
+            return
+        now = time.perf_counter()
+        self.pending["elapsed"] = round(now - self.start, 6)
+        self.pending["iteration_time"] = round(now - self.iteration_start, 6)
+        if self.writer is not None:
+            self.writer.writerow(self.pending)
+        else:
+            self.file.write(json.dumps(self.pending, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.pending = None
+        self.count += 1
+
+    def close(self):
+        """写出尚未写出的记录并关闭文件"""
+        self.end()
+        self.file.close()
+        logging.info(f"迭代遥测: 写入 {self.count} 条记录 -> {self.path}")
@@ -1,3 +1,75 @@
-MAX_ITERATION = 10
+# 列生成最大迭代次数（定价次数），None 为不限制（求解到最优）；达到上限时主问题目标值不是线性松弛的最优值，
+# 需要有界的提前终止时优先使用 CG_RELATIVE_GAP
+MAX_ITERATION = None
 VEHICLE_SPEED = 1
-MAX_TRAVEL_TIME = 1000
\ No newline at end of file
+MAX_TRAVEL_TIME = 1000
+# 原问题模型的建模方式："three_index"（按车辆编号的三下标模型）或 "two_index"（两下标车辆流模型，用弧上的载货/时间流量代替大M约束）
+ORIGIN_MODEL_FORMULATION = "three_index"
+# 三下标原问题模型是否添加对称性破除约束（车辆按编号依次启用，客户按序号限制可服务的车辆）
+ORIGIN_SYMMETRY_BREAKING = True
+# 原问题模型的约束构造方式："batched"（addConstrs 生成器与 tupledict.sum/prod 批量构造）或 "loop"（逐个 addConstr）
+ORIGIN_MODEL_BUILD = "batched"
+# 是否导出原问题模型：求解最优时写 model.lp，不可行时计算 IIS 并写 model.ilp
+ORIGIN_MODEL_EXPORT = False
+
+# 初始列池：扫描算法的起始角度数（节约算法之外的初始解个数）
+INITIAL_SWEEP_STARTS = 8
+# 初始列池：是否对每个初始解做 2-opt / relocate / exchange 局部搜索，以及每个解最多接受的改进次数
+INITIAL_LOCAL_SEARCH = True
+INITIAL_LOCAL_SEARCH_MOVES = 200
+# 磁盘列缓存目录：同一客户集合在不同车辆容量、最大在途时间下运行时复用生成过的列，None 为不使用
+# （launch.py 在算例目录下运行，设为 "../column_cache/" 时各 data_cap_* 算例共用一个缓存目录）
+COLUMN_CACHE_FOLDER = None
+# 列缓存：每个算例最多保留的列数、缓存目录最多保留的算例数
+COLUMN_CACHE_MAX_COLUMNS = 5000
+COLUMN_CACHE_MAX_FILES = 20
+# 可视化方式：None 不绘图；"inline" 在主进程中绘图；"background" 交给后台进程绘图，不阻塞求解（运行结束前等待其完成）
+VISUAL_MODE = "background"
+# 路径图（png）的分辨率
+VISUAL_DPI = 150
+# 迭代动画：每隔多少次迭代取一帧（最后一次迭代总是保留，跳过的迭代加入的列并入下一帧的新列）
+ANIMATION_FRAME_STEP = 1
+# 迭代动画：是否只保留主问题目标值比之前都低的迭代
+ANIMATION_IMPROVED_ONLY = False
+# 列生成迭代遥测文件格式："jsonl" 或 "csv"（写入 output_VRPSPD/cg_metrics.*，每次迭代一条记录并立即 flush），None 为不记录
+CG_METRICS_FORMAT = "jsonl"
+# 是否在标签算法热循环中细分计时（标签扩展、支配检查、缩减成本、双向拼接）；各阶段与代码段的分层耗时
+# （次数、总耗时、分位数）总是记录，运行结束时写入 output_VRPSPD/time_profile.txt。
+# 开启后热循环有约 15%~20% 的额外耗时，默认关闭（需要分析时手动开启），关闭时热循环只多一次判断
+PROFILE = False
+
+# 定价子问题的标签引擎："dict"（字典标签）或 "bitset"（位掩码紧凑标签）
+LABEL_ENGINE = "bitset"
+# 是否在定价子问题中使用双向标签（正反向各扩展约一半的时间资源后拼接），适用于时间限制较宽松的算例
+BIDIRECTIONAL_LABELING = False
+# 定价级联依次尝试的层级（"exact" 总在最后），可选 "local_search"、"greedy_insertion"、"limited_labeling"
+PRICING_CASCADE_LEVELS = ["local_search", "greedy_insertion", "limited_labeling", "exact"]
+# limited_labeling 层中每个节点最多扩展的标签数
+PRICING_HEURISTIC_MAX_LABELS = 3
+# ng-route 松弛：每个客户的初始邻域大小（含自身），None 为不使用 ng-route（初等路径）
+NG_NEIGHBOURHOOD_SIZE = None
+# ng-route 邻域动态扩展的上限，None 为不设上限（可一直扩展到初等路径）
+NG_MAX_NEIGHBOURHOOD_SIZE = None
+# 列管理：连续多少次主问题求解都为非基变量且缩减成本大于阈值的列被移入侧池，None 为不移除
+COLUMN_PURGE_AGE = 10
+# 列管理：非基变量的缩减成本大于该值才累计"老化"次数
+COLUMN_PURGE_RC_THRESHOLD = 1.0
+# 对偶稳定化方式："smoothing"（Wentges 平滑）、"box_step"（盒子截断），None 为直接使用主问题对偶值
+DUAL_STABILIZATION = None
+# Wentges 平滑系数：分离点 = alpha * 稳定中心 + (1 - alpha) * 主问题对偶值
+DUAL_SMOOTHING_ALPHA = 0.5
+# box-step 的盒子半径
+DUAL_BOX_WIDTH = 10.0
+# 列生成提前终止的相对间隙：(主问题目标值 - 拉格朗日下界) / 主问题目标值 不超过该值时停止，None 为求解到最优
+CG_RELATIVE_GAP = None
+# 是否用分支定价求整数解（False 时将最终列集合作为整数规划求解）
+BRANCH_AND_PRICE = False
+# 分支定价：车辆数为分数时是否先按车辆数分支（否则只按弧流量分支）
+BNP_BRANCH_ON_VEHICLES = True
+# 分支定价：最多处理的节点数、时间上限（秒），None 为不限制
+BNP_MAX_NODES = None
+BNP_TIME_LIMIT = None
+# 分支定价：并行处理节点的进程数，None 或 1 为串行
+BNP_WORKERS = None
+# 精确定价按第一个客户分区并行的进程数，None 为串行
+PRICING_WORKERS = None
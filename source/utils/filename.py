@@ -1,2 +1,4 @@
 CUSTOMER_FILE = 'customerInfo.csv'
-VEHICLE_FILE = 'vehicleInfo.csv'
\ No newline at end of file
+VEHICLE_FILE = 'vehicleInfo.csv'
+CG_METRICS_FILE = 'cg_metrics'
+TIME_PROFILE_FILE = 'time_profile.txt'
\ No newline at end of file
@@ -1,36 +1,110 @@
 import time
 import logging
 import functools
+import os
+from . import constant, filename
 
-# 定义全局变量用于存储任务及其相应的时间
-tasks = []
 
+class ProfileNode:
+    """分层耗时分析树的一个节点：同一上级代码段中同名代码段的所有调用汇总在一起"""
+    __slots__ = ("name", "children", "samples")
 
-# 函数用于添加任务及其相应的时间到全局变量中
-def add_task(
-        task_name: str
-        , time_taken: float
-):
-    global tasks
-    tasks.append((task_name, time_taken))
+    def __init__(self, name: str):
+        self.name = name
+        self.children = {}  # 名称 -> ProfileNode，按第一次出现的顺序
+        self.samples = []  # 每次调用的耗时（秒）
+
+    def child(self, name: str):
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = ProfileNode(name)
+        return node
+
+    @property
+    def count(self):
+        return len(self.samples)
+
+    @property
+    def total(self):
+        return sum(self.samples)
+
+    def percentile(self, q: float):
+        """耗时的 q 分位数（最近秩法）"""
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))]
+
+
+class _Section:
+    """计时代码段：进入时压入当前路径，退出时记录耗时并弹出"""
+    __slots__ = ("name", "node", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.node = _stack[-1].child(self.name)
+        _stack.append(self.node)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.node.samples.append(time.perf_counter() - self.start)
+        _stack.pop()
+        return False
+
+
+_root = ProfileNode("total")
+_stack = [_root]  # 当前所在代码段的路径
+
+
+def is_enabled() -> bool:
+    """是否对标签算法热循环细分计时（constant.PROFILE）；热循环在进入前调用一次，关闭时循环内只多一次局部变量判断"""
+    return constant.PROFILE
+
+
+def section(name: str):
+    """
+    计时上下文管理器：with timing.section("主问题求解"): ...
+    嵌套使用时形成层级，同一上级中的同名代码段汇总计数、总耗时与分位数。
+    代码段计时总是开启（每次调用只有两次计时与一次列表追加），只用于阶段与每次迭代调用的函数，不用于热循环
+    """
+    return _Section(name)
+
+
+def add_time(name: str, time_taken: float):
+    """
+    把在别处累计的耗时（如标签算法热循环中的支配检查）记为当前代码段下的一个子段的一次调用；
+    只在 constant.PROFILE 开启时记录
+    """
+    if constant.PROFILE:
+        _stack[-1].child(name).samples.append(time_taken)
+
+
+def profiled(task_name: str):
+    """计时装饰器（不写日志），用于每次迭代都会调用的函数"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Section(task_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
 
 
 def record_time_decorator(
         task_name: str
 ):
+    """计时装饰器，并把每次调用的耗时写入日志，用于只调用少数几次的阶段（建模、列生成、整数解等）"""
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            st = time.time()
-            # 调用原函数
-            result = func(*args, **kwargs)
-            ed = time.time()
-            total_time = round(ed - st, 4)
-            current_task_name = task_name
-            logging.info('{}: {}'.format(current_task_name, total_time))
-            if current_task_name == "添加固定约束时长":
-                current_task_name = '{}（{}）'.format(current_task_name, func.__name__)
-            add_task(task_name=current_task_name, time_taken=total_time)
+            st = time.perf_counter()
+            # 调用原函数（同时记为一个代码段）
+            with _Section(task_name):
+                result = func(*args, **kwargs)
+            logging.info('{}: {}'.format(task_name, round(time.perf_counter() - st, 4)))
             return result
 
         return wrapper
@@ -38,13 +112,46 @@ def record_time_decorator(
     return decorator
 
 
+def reset():
+    """清空分析结果"""
+    global _root
+    _root = ProfileNode("total")
+    _stack[:] = [_root]
+
+
+def _walk(node: ProfileNode, path=()):
+    for child in node.children.values():
+        yield path + (child.name,), child, node
+        yield from _walk(child, path + (child.name,))
+
+
+def totals():
+    """各代码段的总耗时 [(以 "/" 连接的层级路径, 总耗时)]，按层级先序排列"""
+    return [("/".join(path), node.total) for path, node, _ in _walk(_root)]
+
+
+def report() -> str:
+    """分层耗时报告：每个代码段的调用次数、总耗时、平均值、分位数、最大值与占上级代码段的比例"""
+    lines = [f"{'次数':>6}{'总计(s)':>11}{'平均(ms)':>10}{'p50(ms)':>10}{'p90(ms)':>10}{'p99(ms)':>10}"
+             f"{'最大(ms)':>10}{'占上级':>8}  代码段"]
+    root_total = sum(child.total for child in _root.children.values())
+    for path, node, parent in _walk(_root):
+        parent_total = root_total if parent is _root else parent.total
+        share = node.total / parent_total if parent_total > 0 else 0
+        lines.append(f"{node.count:>8}{node.total:>13.4f}{node.total / node.count * 1e3:>12.3f}"
+                     f"{node.percentile(0.5) * 1e3:>10.3f}{node.percentile(0.9) * 1e3:>10.3f}"
+                     f"{node.percentile(0.99) * 1e3:>10.3f}{max(node.samples) * 1e3:>12.3f}{share:>11.1%}  "
+                     f"{'  ' * (len(path) - 1)}{node.name}")
+    return "\n".join(lines) + "\n"
+
+
 def out_profile(
         output_folder: str
 ):
-    # 打开文本文件，准备写入
-    with open("{}time_profile.txt".format(output_folder), "w", encoding='utf-8') as file:
-        # 写入任务及其相应的时间
-        for task, time_taken in tasks:
-            file.write(f"{task}: {time_taken}\n")
-
-    file.close()
\ No newline at end of file
+    """把分层耗时报告写入 output_folder 下的 time_profile.txt（没有记录时不写）；热循环的细分计时只在 constant.PROFILE 开启时出现"""
+    if not _root.children:
+        return
+    path = os.path.join(output_folder, filename.TIME_PROFILE_FILE)
+    with open(path, "w", encoding='utf-8') as file:
+        file.write(report())
+    logging.info(f"耗时分析报告 -> {path}")
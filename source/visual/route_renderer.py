@@ -0,0 +1,124 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")  # 无界面后端：只写图片文件，不弹出窗口，也不依赖显示环境
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+from ..utils import constant
+
+
+class RouteRenderer:
+    """
+    批量绘制客户点与车辆路径：
+    - 静态背景（客户点、编号、客户两两之间的灰色虚线）的坐标与线段数组按算例缓存，各张图共用；
+    - 所有虚线合并为一个 LineCollection，所有客户点一次 scatter，所有路径弧一次 quiver，
+      因此 artist 数量不随客户数平方增长（编号文字除外，每个客户一个）。
+    """
+    _cache = {}  # 客户坐标 -> RouteRenderer
+
+    def __init__(self, positions: dict):
+        """
+        :param positions: {客户编号: (x, y)}，即 InputData.get_customer_positions() 的返回值
+        """
+        self.ids = list(positions)
+        self.index = {cust_id: p for p, cust_id in enumerate(self.ids)}
+        self.xy = np.array([positions[cust_id] for cust_id in self.ids], dtype=float)
+        i, j = np.triu_indices(len(self.ids), k=1)
+        self.edge_segments = np.stack([self.xy[i], self.xy[j]], axis=1)  # (边数, 2个端点, 2个坐标)
+
+    @classmethod
+    def for_positions(cls, positions: dict):
+        """同一组客户坐标只构造一次背景数据"""
+        key = tuple(positions.items())
+        if key not in cls._cache:
+            cls._cache[key] = cls(positions)
+        return cls._cache[key]
+
+    def draw_background(self, ax, title):
+        """绘制静态背景：客户间虚线、客户点与编号、标题与坐标轴"""
+        ax.add_collection(LineCollection(self.edge_segments, colors='gray', linestyles='--', linewidths=0.5))
+        ax.scatter(self.xy[:, 0], self.xy[:, 1], color='blue', s=100, zorder=2)
+        for cust_id, (x, y) in zip(self.ids, self.xy):
+            ax.text(x, y, f"{cust_id}", fontsize=12, ha='right')
+        ax.set_title(title, fontsize=16)
+        ax.set_xlabel("X Coordinate", fontsize=12)
+        ax.set_ylabel("Y Coordinate", fontsize=12)
+        ax.grid(True, linestyle='--', alpha=0.5)
+        ax.autoscale_view()
+
+    def draw_routes(self, ax, paths, colors, width=0.003, alpha=1.0):
+        """
+        把所有路径的弧合并为一次 quiver 绘制
+        :param paths: 路径（客户编号序列）列表
+        :param colors: 与 paths 一一对应的颜色
+        :param width: 箭杆宽度（占坐标轴宽度的比例）
+        :param alpha: 透明度
+        :return: quiver 对象（动画中逐帧替换），没有弧时返回 None
+        """
+        starts, ends, arc_colors = [], [], []
+        for path, color in zip(paths, colors):
+            nodes = [self.index[cust_id] for cust_id in path]
+            starts += nodes[:-1]
+            ends += nodes[1:]
+            arc_colors += [color] * (len(nodes) - 1)
+        if not starts:
+            return None
+        start_xy = self.xy[starts]
+        delta = self.xy[ends] - start_xy
+        return ax.quiver(start_xy[:, 0], start_xy[:, 1], delta[:, 0], delta[:, 1], color=arc_colors,
+                         angles='xy', scale_units='xy', scale=1, width=width, headwidth=5, headlength=6,
+                         alpha=alpha, zorder=3)
+
+    def save_routes(self, paths, colors, title, save_path, figsize=(10, 8)):
+        """绘制背景与路径并保存为图片（不调用 plt.show()）"""
+        fig, ax = plt.subplots(figsize=figsize)
+        self.draw_background(ax, title)
+        self.draw_routes(ax, paths, colors)
+        save_dir = os.path.dirname(save_path)
+        if save_dir:
+            os.makedirs(save_dir, exist_ok=True)
+        # bbox_inches避免标题/标签被截断
+        fig.savefig(save_path, dpi=constant.VISUAL_DPI, bbox_inches='tight')
+        plt.close(fig)
+
+
+_executor = None
+_futures = []
+
+
+def submit(job, *args, **kwargs):
+    """
+    按 constant.VISUAL_MODE 执行绘图任务：None 不绘图；"inline" 在当前进程立即绘制；
+    "background" 交给一个后台进程绘制，求解不必等待绘图完成（job 及其参数需可序列化）
+    :param job: 绘图函数，通常是可视化类的绑定方法，如 visualization.visualize_routes
+    """
+    global _executor
+    mode = constant.VISUAL_MODE
+    if mode is None:
+        return
+    if mode == "inline":
+        job(*args, **kwargs)
+    elif mode == "background":
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        _futures.append(_executor.submit(job, *args, **kwargs))
+    else:
+        raise ValueError(f"未知的可视化方式: {mode}")
+
+
+def wait():
+    """等待后台绘图任务完成并关闭后台进程，绘图失败只记录日志，不影响求解结果"""
+    global _executor
+    for future in _futures:
+        try:
+            future.result()
+        except Exception as e:
+            logging.exception(f"后台绘图失败: {e}")
+    _futures.clear()
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import gurobipy as gp  # noqa: E402
+from source.info.input_data import InputData  # noqa: E402
+from source.utils import constant  # noqa: E402
+
+DATA_FOLDER = os.path.join(ROOT, "data")
+
+
+@pytest.fixture(autouse=True)
+def quiet_run(monkeypatch):
+    """测试中不写遥测文件、不绘图，也不输出 Gurobi 日志；对 constant 的修改在每个测试结束后还原"""
+    gp.setParam("OutputFlag", 0)
+    monkeypatch.setattr(constant, "CG_METRICS_FORMAT", None)
+    monkeypatch.setattr(constant, "VISUAL_MODE", None)
+    monkeypatch.setattr(constant, "COLUMN_CACHE_FOLDER", None)
+
+
+@pytest.fixture
+def load_instance():
+    """按 data 目录下的算例名读入 InputData（弧预处理按读入时的 constant 进行）"""
+    def load(name: str) -> InputData:
+        return InputData(input_folder=os.path.join(DATA_FOLDER, name, ""))
+
+    return load
@@ -0,0 +1,37 @@
+import pytest
+
+from source.model.model_manager import ModelManager
+from source.model.origin_model import OriginModel
+from source.utils import constant
+
+
+def solve_origin(monkeypatch, input_data, formulation):
+    monkeypatch.setattr(constant, "ORIGIN_MODEL_FORMULATION", formulation)
+    origin_model = OriginModel(input_data=input_data)
+    origin_model.initialize()
+    return origin_model.solve()
+
+
+@pytest.mark.parametrize("name", ["data_cap_80", "data_cap_90", "data_cap_150"])
+def test_formulations_match_column_generation(monkeypatch, load_instance, name):
+    """两种原问题建模方式与列生成（分支定价求到整数最优）使用相同的载货量规则，最优值一致"""
+    input_data = load_instance(name)
+    three_index = solve_origin(monkeypatch, input_data, "three_index")
+    two_index = solve_origin(monkeypatch, input_data, "two_index")
+    monkeypatch.setattr(constant, "BRANCH_AND_PRICE", True)
+    model_manager = ModelManager(input_data=input_data)
+    model_manager.run_cg_model()
+
+    assert three_index["total_cost"] == pytest.approx(two_index["total_cost"], abs=1e-4)
+    assert model_manager.imp_total_cost == pytest.approx(two_index["total_cost"], abs=1e-4)
+
+
+@pytest.mark.parametrize("formulation", ["three_index", "two_index"])
+def test_departure_load_within_capacity(monkeypatch, load_instance, formulation):
+    """车辆从车场出发时装载所服务客户的全部配送量，不超过车辆容量"""
+    input_data = load_instance("data_cap_80")
+    solution = solve_origin(monkeypatch, input_data, formulation)
+    for k, path in solution["routes"].items():
+        delivery = sum(input_data.customer_dict[i].delivery_qty for i in path[1:-1])
+        assert delivery <= input_data.vehicle_info.capacity
+        assert solution["loads"][k][0] == pytest.approx(delivery, abs=1e-6)
@@ -0,0 +1,29 @@
+import pytest
+
+from source.model.model_manager import ModelManager
+from source.model.ng_route import NgNeighbourhood
+from source.model.pricing_cascade import PricingCascade
+from source.utils import constant
+
+
+def run_cg(input_data):
+    model_manager = ModelManager(input_data=input_data)
+    model_manager.run_cg_model()
+    return model_manager
+
+
+@pytest.mark.parametrize("engine", ["dict", "bitset"])
+def test_cg_with_default_levels(monkeypatch, load_instance, engine):
+    """默认级联（含 limited_labeling 层）在两种标签引擎下都能完成列生成，并得到相同的线性松弛值"""
+    monkeypatch.setattr(constant, "LABEL_ENGINE", engine)
+    model_manager = run_cg(load_instance("data_cap_80"))
+    assert model_manager.pricing_cascade.level_stats["limited_labeling"]["calls"] > 0
+    assert model_manager.rmp.mp_obj == pytest.approx(429.1196, abs=1e-3)
+    assert model_manager.imp_total_cost == pytest.approx(464.0294, abs=1e-3)
+
+
+def test_dict_engine_rejects_ng_route_on_construction(monkeypatch, load_instance):
+    monkeypatch.setattr(constant, "LABEL_ENGINE", "dict")
+    input_data = load_instance("data_cap_80")
+    with pytest.raises(ValueError):
+        PricingCascade(input_data=input_data, ng_neighbourhood=NgNeighbourhood(input_data=input_data, size=3))
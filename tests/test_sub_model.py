@@ -0,0 +1,69 @@
+import itertools
+import os
+import random
+
+import pytest
+
+from benchmark.pricing_benchmark import write_random_instance
+from source.info.input_data import InputData
+from source.model.sub_model import PricingSubproblem
+from source.utils import constant
+
+
+def simulate(input_data, path):
+    """独立于标签递推的检查：出发时装载全部配送量，逐个客户卸货、取货，检查每段弧上的载货量与在途时间"""
+    customers = input_data.customer_dict
+    load = sum(customers[i].delivery_qty for i in path[1:-1])
+    if load > input_data.vehicle_info.capacity:
+        return False
+    total_time = 0
+    for i, j in zip(path, path[1:]):
+        total_time += input_data.distance_matrix[i, j] / constant.VEHICLE_SPEED
+        if j != 0:
+            total_time += customers[j].service_time
+            load += customers[j].pick_up_qty - customers[j].delivery_qty
+            if load > input_data.vehicle_info.capacity:
+                return False
+    return total_time <= constant.MAX_TRAVEL_TIME
+
+
+@pytest.fixture(params=[(3, 7, 60, 1000), (5, 6, 80, 1000), (1, 7, 60, 400)], ids=lambda p: f"seed{p[0]}")
+def random_case(request, monkeypatch, tmp_path):
+    seed, num_customers, capacity, max_travel_time = request.param
+    monkeypatch.setattr(constant, "MAX_TRAVEL_TIME", max_travel_time)
+    write_random_instance(str(tmp_path), num_customers, capacity, seed)
+    input_data = InputData(input_folder=os.path.join(str(tmp_path), ""))
+    rng = random.Random(seed)
+    dual_values = {'pi': {i: rng.uniform(0, 250) for i in input_data.customer_dict if i != 0},
+                   'theta': rng.uniform(-100, 0)}
+    return input_data, dual_values
+
+
+def all_paths(num_customers):
+    for size in range(1, num_customers + 1):
+        for customers in itertools.permutations(range(1, num_customers + 1), size):
+            yield [0, *customers, 0]
+
+
+def test_evaluate_path_matches_simulation(random_case):
+    input_data, dual_values = random_case
+    checker = PricingSubproblem(dual_values=dual_values, input_data=input_data, engine="dict")
+    for path in all_paths(len(input_data.customer_dict) - 1):
+        assert (checker.evaluate_path(path) is not None) == simulate(input_data, path), path
+
+
+@pytest.mark.parametrize("options", [{"engine": "dict"}, {"engine": "bitset", "bidirectional": False},
+                                     {"engine": "bitset", "bidirectional": True}],
+                         ids=["dict", "bitset", "bidirectional"])
+def test_min_reduced_cost_matches_enumeration(random_case, options):
+    """各标签引擎找到的最小缩减成本与枚举所有可行路径的结果一致"""
+    input_data, dual_values = random_case
+    dist = input_data.distance_matrix
+    expected = min((sum(dist[i, j] for i, j in zip(path, path[1:]))
+                    - sum(dual_values['pi'][i] for i in path[1:-1]) - dual_values['theta']
+                    for path in all_paths(len(input_data.customer_dict) - 1) if simulate(input_data, path)),
+                   default=0.0)
+    routes = PricingSubproblem(dual_values=dual_values, input_data=input_data, **options).solve()
+    assert all(simulate(input_data, route["path"]) for route in routes)
+    found = min((route["reduced_cost"] for route in routes), default=0.0)
+    assert found == pytest.approx(min(expected, 0.0), abs=1e-6)
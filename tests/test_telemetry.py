@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from source.model.model_manager import ModelManager
+from source.utils import constant, filename
+
+
+def test_one_record_per_iteration(monkeypatch, tmp_path, load_instance):
+    """每次迭代结束时写出一条记录，耗时只计本次迭代"""
+    input_data = load_instance("data_cap_80")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(constant, "CG_METRICS_FORMAT", "jsonl")
+    model_manager = ModelManager(input_data=input_data)
+    model_manager.run_cg_model()
+
+    with open(tmp_path / "output_VRPSPD" / f"{filename.CG_METRICS_FILE}.jsonl", encoding="utf-8") as file:
+        records = [json.loads(line) for line in file]
+    assert [record["iteration"] for record in records] == list(range(len(model_manager.iteration_records)))
+    assert [record["rmp_obj"] for record in records] == \
+           pytest.approx([record["mp_obj"] for record in model_manager.iteration_records])
+    assert records[-1]["pricing_level"] == "exact"
+    for previous, record in zip([None] + records, records):
+        assert record["rmp_time"] + (record["pricing_time"] or 0) <= record["iteration_time"] <= record["elapsed"]
+        if previous is not None:
+            assert record["elapsed"] - previous["elapsed"] >= record["iteration_time"]